@@ -2,6 +2,8 @@ import os
 import json
 import time
 import re
+import math
+import heapq
 import requests
 import difflib
 from google import genai
@@ -9,6 +11,9 @@ from google.genai import types
 from dotenv import load_dotenv
 from PIL import Image
 from io import BytesIO
+from result_store import ResultStore
+from crawl_frontier import product_key
+from blob_cache import BlobCache, BLOB_CACHE_DIR
 
 # ======================================================
 # [설정] 환경 변수 및 상수
@@ -17,6 +22,7 @@ load_dotenv()
 API_KEY = os.getenv("GEMINI_API_KEY")
 
 INPUT_FILE = 's2b_results.json'
+INPUT_STORE_FILE = 's2b_results.jsonl'
 OUTPUT_FILE = 's2b_bot_input.json'
 CATEGORY_FILE = 's2b_categories.json'
 IMAGE_DIR = 'processed_images'
@@ -24,6 +30,11 @@ IMAGE_DIR = 'processed_images'
 MAIN_IMG_SIZE = (262, 262)
 DETAIL_IMG_WIDTH = 680
 
+# 카테고리 후보 검색 (문자 n-gram 역색인 + BM25)
+CATEGORY_NGRAM_SIZES = (2, 3)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
 if not API_KEY:
     print("❌ 오류: .env 파일에 GEMINI_API_KEY가 없습니다.")
     exit()
@@ -39,6 +50,7 @@ class DataUtils:
         self.raw_categories = self._load_json(CATEGORY_FILE)
         self.enforcer_pattern = re.compile(r"[^가-힣a-zA-Z0-9\s\.\,\-\_\/\(\)\[\]]")
         self.flat_categories = self._flatten_categories()
+        self._build_category_index()
         
     def _load_json(self, filepath):
         if os.path.exists(filepath):
@@ -67,16 +79,43 @@ class DataUtils:
                     flat_list.append({"path": c1_txt, "c1": c1_val, "c2": None, "c3": None})
         return flat_list
 
+    @staticmethod
+    def _ngrams(text):
+        """구분자(공백, >, / 등)로 나눈 조각별 문자 2/3-gram (1글자 조각은 그대로). 한글 복합어도 부분 일치 가능"""
+        grams = []
+        for seg in re.split(r"[\s>/,·()\[\]]+", (text or "").lower()):
+            if len(seg) == 1: grams.append(seg)
+            for n in CATEGORY_NGRAM_SIZES:
+                grams += [seg[i:i + n] for i in range(len(seg) - n + 1)]
+        return grams
+
+    def _build_category_index(self):
+        """flat_categories의 경로로 n-gram -> [(문서 번호, 빈도)] 역색인을 1회 구축"""
+        self._postings = {}
+        self._doc_len = []
+        for doc_id, item in enumerate(self.flat_categories):
+            grams = self._ngrams(item['path'])
+            self._doc_len.append(len(grams))
+            counts = {}
+            for g in grams: counts[g] = counts.get(g, 0) + 1
+            for g, tf in counts.items():
+                self._postings.setdefault(g, []).append((doc_id, tf))
+        n_docs = len(self._doc_len)
+        self._avg_len = (sum(self._doc_len) / n_docs) if n_docs else 1.0
+        self._idf = {g: math.log(1 + (n_docs - len(p) + 0.5) / (len(p) + 0.5)) for g, p in self._postings.items()}
+
     def search_relevant_categories(self, query, top_k=50):
-        query_parts = set(query.replace(">", " ").split())
-        scored_cats = []
-        for item in self.flat_categories:
-            score = 0
-            for q in query_parts:
-                if len(q) > 1 and q in item['path']: score += 1
-            if score > 0: scored_cats.append((score, item))
-        scored_cats.sort(key=lambda x: x[0], reverse=True)
-        results = [x[1] for x in scored_cats[:top_k]]
+        """질의의 n-gram 역색인 목록만 순회하여 BM25 점수 상위 top_k 카테고리를 반환합니다."""
+        scores = {}
+        for g in set(self._ngrams(query)):
+            postings = self._postings.get(g)
+            if not postings: continue
+            idf = self._idf[g]
+            for doc_id, tf in postings:
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self._doc_len[doc_id] / self._avg_len)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+        top = heapq.nlargest(top_k, scores.items(), key=lambda x: (x[1], -x[0]))
+        results = [self.flat_categories[doc_id] for doc_id, _ in top]
         if len(results) < 5:
              defaults = [x for x in self.flat_categories if "기타" in x['path'] or "전자" in x['path']]
              results.extend(defaults[:10])
@@ -157,9 +196,14 @@ class DataUtils:
 class ImageProcessor:
     def __init__(self):
         if not os.path.exists(IMAGE_DIR): os.makedirs(IMAGE_DIR)
+        # 크롤러가 저장한 이미지 캐시가 있으면 재다운로드 없이 사용
+        self.blob_cache = BlobCache() if os.path.isdir(BLOB_CACHE_DIR) else None
 
     def download_image(self, url):
         if not url or 'http' not in url: return None
+        if self.blob_cache:
+            data = self.blob_cache.get(url)
+            if data: return BytesIO(data)
         try:
             headers = {'User-Agent': 'Mozilla/5.0'}
             response = requests.get(url, headers=headers, timeout=5)
@@ -243,17 +287,27 @@ class DataConverter:
         }}
         """
 
-    def process(self):
-        print(f"🚀 [Converter v9.4] 모델명 추출 로직 수정 완료...")
+    def load_items(self):
+        """(아이템 이터레이터, 건수) 반환. JSONL 저장소가 있으면 스트리밍, 없으면 기존 JSON 사용"""
+        if os.path.exists(INPUT_STORE_FILE):
+            store = ResultStore(INPUT_STORE_FILE, key_fn=lambda record: product_key(record.get('url', '')))
+            return store.iter_records(), len(store)
         try:
             with open(INPUT_FILE, 'r', encoding='utf-8') as f: raw_data = json.load(f)
+            return iter(raw_data), len(raw_data)
         except:
+            return iter([]), 0
+
+    def process(self):
+        print(f"🚀 [Converter v9.4] 모델명 추출 로직 수정 완료...")
+        raw_data, total = self.load_items()
+        if not total:
             print("❌ 원본 데이터가 없습니다."); return
 
         final_result = []
 
         for idx, item in enumerate(raw_data):
-            print(f"\n🔹 [{idx+1}/{len(raw_data)}] 처리 중: {item.get('name')[:15]}...")
+            print(f"\n🔹 [{idx+1}/{total}] 처리 중: {item.get('name')[:15]}...")
             
             query = f"{item.get('name')} {item.get('category')}"
             candidates = self.utils.search_relevant_categories(query, top_k=50)
@@ -330,6 +384,8 @@ class DataConverter:
 
         with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
             json.dump(final_result, f, ensure_ascii=False, indent=4)
+        cache = self.img_processor.blob_cache
+        if cache: print(f"    🖼️ 이미지 캐시 적중 {cache.hits}건 / 미스 {cache.misses}건")
         print(f"\n✅ 전체 완료! '{OUTPUT_FILE}' 확인하세요.")
 
 if __name__ == "__main__":
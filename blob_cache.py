@@ -0,0 +1,95 @@
+import os
+import time
+import hashlib
+import threading
+from urllib.parse import urlsplit, urlunsplit
+
+from result_store import ResultStore
+
+# ======================================================
+# [설정] 이미지 Blob 캐시
+# ======================================================
+BLOB_CACHE_DIR = 'image_cache'
+MAX_BLOB_BYTES = 20 * 1024 * 1024   # 이보다 큰 응답은 캐시하지 않음
+
+def normalize_blob_url(url):
+    """캐시 키용 URL 정규화 ('//' 스킴 보정, fragment 제거)"""
+    if not url: return ""
+    url = url.strip()
+    if url.startswith("//"): url = "https:" + url
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, parts.query, ""))
+
+class BlobCache:
+    """
+    URL -> 이미지 바이트 캐시 (Content-Addressed)
+    - objects/ab/<sha256>.bin : 원본 바이트 (같은 이미지는 URL이 달라도 1개만 저장)
+    - index.jsonl             : 정규화 URL -> 해시 (ResultStore 재사용)
+    - 크롤러(브라우저)가 받은 이미지를 put()으로 저장하고, 변환기(ImageProcessor)가 get()으로 재사용합니다.
+    """
+
+    def __init__(self, root=BLOB_CACHE_DIR, index_name="index.jsonl"):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self.index = ResultStore(os.path.join(root, index_name), key_fn=lambda entry: entry.get("url"))
+        self._lock = threading.Lock()
+        self._shas = None
+        self.hits = 0
+        self.misses = 0
+
+    def _object_path(self, sha):
+        return os.path.join(self.objects_dir, sha[:2], f"{sha}.bin")
+
+    def _load_index(self):
+        if self._shas is None:
+            self._shas = {entry["url"]: entry["sha"] for entry in self.index.iter_records()}
+        return self._shas
+
+    def put(self, url, data, content_type=None):
+        """바이트를 저장하고 해시를 반환합니다. (이미 같은 내용으로 등록된 URL이면 건너뜀)"""
+        key = normalize_blob_url(url)
+        if not key or not data or len(data) > MAX_BLOB_BYTES: return None
+        sha = hashlib.sha256(data).hexdigest()
+
+        with self._lock:
+            if self._load_index().get(key) == sha: return sha
+
+        path = self._object_path(sha)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+        with self._lock:
+            self.index.append({"url": key, "sha": sha, "type": content_type, "size": len(data), "ts": time.time()})
+            self._shas[key] = sha
+        return sha
+
+    def get(self, url):
+        """캐시된 바이트 또는 None"""
+        key = normalize_blob_url(url)
+        with self._lock:
+            sha = self._load_index().get(key)
+        if sha:
+            try:
+                with open(self._object_path(sha), "rb") as f:
+                    data = f.read()
+                self.hits += 1
+                return data
+            except OSError: pass
+        self.misses += 1
+        return None
+
+    def __contains__(self, url):
+        with self._lock:
+            return normalize_blob_url(url) in self._load_index()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._load_index())
+
+    def close(self):
+        self.index.close()
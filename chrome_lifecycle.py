@@ -0,0 +1,216 @@
+import os
+import re
+import time
+import shutil
+import signal
+import subprocess
+import requests
+
+try:
+    import psutil  # 선택 의존성: 있으면 프로세스 조회/종료에 사용
+except ImportError:
+    psutil = None
+
+# ======================================================
+# [환경] 크롬 경로 (OS별 기본값)
+# ======================================================
+if os.name == "nt":
+    CHROME_PATH = r"C:\Program Files\Google\Chrome\Application\chrome.exe"
+    CHROME_USER_DIR = r"C:\ChromeDev"
+else:
+    CHROME_PATH = (shutil.which("google-chrome") or shutil.which("google-chrome-stable")
+                   or shutil.which("chromium") or shutil.which("chromium-browser") or "/usr/bin/google-chrome")
+    CHROME_USER_DIR = os.path.expanduser("~/.chrome-dev")
+
+CHROME_ARGS = [
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--window-size=1920,1080",
+]
+READY_TIMEOUT = 15
+
+# ======================================================
+# [모듈 1] 프로세스 조회 / 실행 / 종료 (Windows + Linux)
+# ======================================================
+def _user_dir_flag(user_dir):
+    return f"--user-data-dir={user_dir}"
+
+def _cmdline_has_user_dir(cmdline, user_dir):
+    """
+    명령줄 문자열에 --user-data-dir=<user_dir>가 하나의 인자로 정확히 있는지 (따옴표 허용)
+    ('~/.chrome-dev'가 '~/.chrome-dev_s2b' 같은 다른 프로필과 겹쳐 매칭되지 않도록 인자 경계까지 확인)
+    """
+    pattern = r'(?:^|[\s"])--user-data-dir="?' + re.escape(user_dir) + r'"?(?=$|[\s"])'
+    return re.search(pattern, cmdline) is not None
+
+def chrome_processes(user_dir=CHROME_USER_DIR):
+    """해당 user-data-dir로 실행된 크롬 프로세스 트리의 [(pid, rss_bytes)] (인자 단위 정확 일치)"""
+    flag = _user_dir_flag(user_dir)
+    procs = []
+
+    if psutil is not None:
+        for p in psutil.process_iter(["pid", "cmdline", "memory_info"]):
+            try:
+                if flag in (p.info["cmdline"] or []):
+                    procs.append((p.info["pid"], p.info["memory_info"].rss))
+            except Exception: continue
+        return procs
+
+    if os.path.isdir("/proc"):
+        page_size = os.sysconf("SC_PAGE_SIZE")
+        for pid in os.listdir("/proc"):
+            if not pid.isdigit(): continue
+            try:
+                with open(f"/proc/{pid}/cmdline", "rb") as f:
+                    args = f.read().decode(errors="ignore").split("\0")
+                if flag not in args: continue
+                with open(f"/proc/{pid}/statm") as f:
+                    rss_pages = int(f.read().split()[1])
+                procs.append((int(pid), rss_pages * page_size))
+            except Exception: continue
+        return procs
+
+    if os.name == "nt":
+        # wmic LIKE는 부분 일치라 다른 프로필까지 잡히므로, 크롬 프로세스 전체를 받아 명령줄을 직접 검사
+        try:
+            out = subprocess.run(
+                'wmic process where "name=\'chrome.exe\'" get CommandLine,ProcessId,WorkingSetSize /format:csv',
+                shell=True, capture_output=True, text=True
+            ).stdout
+            for line in out.splitlines():
+                # Node,CommandLine,ProcessId,WorkingSetSize (명령줄에 쉼표가 있을 수 있어 뒤에서부터 분리)
+                cols = line.strip().rsplit(",", 2)
+                if len(cols) != 3 or not cols[1].isdigit(): continue
+                cmdline = cols[0].split(",", 1)[1] if "," in cols[0] else ""
+                if _cmdline_has_user_dir(cmdline, user_dir):
+                    procs.append((int(cols[1]), int(cols[2] or 0)))
+        except Exception: pass
+    return procs
+
+def wait_until_ready(port, timeout=READY_TIMEOUT):
+    """CDP 엔드포인트가 응답할 때까지 대기 (고정 sleep 대신 폴링)"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            requests.get(f"http://127.0.0.1:{port}/json/version", timeout=1)
+            return True
+        except Exception:
+            time.sleep(0.3)
+    return False
+
+def launch_chrome(port, user_dir=CHROME_USER_DIR, extra_args=None):
+    print(f"🚀 [System] Chrome 실행 중... (Port: {port})")
+    if not os.path.exists(CHROME_PATH):
+        print(f"❌ 크롬 실행 파일을 찾을 수 없습니다: {CHROME_PATH}")
+        return False
+
+    cmd = [CHROME_PATH, f"--remote-debugging-port={port}", _user_dir_flag(user_dir)] + CHROME_ARGS + (extra_args or [])
+    try:
+        subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except Exception as e:
+        print(f"    ❌ Chrome 실행 실패: {e}")
+        return False
+    if not wait_until_ready(port):
+        print("    ⚠️ Chrome CDP 응답 대기 시간 초과")
+        return False
+    return True
+
+def kill_chrome(user_dir=CHROME_USER_DIR):
+    print("♻️ [System] 메모리 초기화를 위해 Chrome 재시작 준비...")
+    pids = [pid for pid, _ in chrome_processes(user_dir)]
+    for pid in pids:
+        try:
+            if os.name == "nt" and psutil is None:
+                subprocess.run(["taskkill", "/F", "/PID", str(pid)], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            else:
+                os.kill(pid, signal.SIGTERM)
+        except: pass
+
+    # 종료 확인 (남아 있으면 강제 종료)
+    deadline = time.time() + 5
+    while time.time() < deadline and chrome_processes(user_dir):
+        time.sleep(0.2)
+    if os.name != "nt":
+        for pid, _ in chrome_processes(user_dir):
+            try: os.kill(pid, signal.SIGKILL)
+            except: pass
+
+# ======================================================
+# [모듈 2] 리소스 기반 생명주기 관리자
+# ======================================================
+class ChromeManager:
+    """
+    크롬 1개 인스턴스의 생명주기 관리
+    - 배치가 끝날 때마다 after_batch()를 호출하면 프로세스 트리 RSS를 측정하고,
+      처리 페이지 수(restart_every) 또는 메모리(max_rss_mb) 임계치를 넘으면 브라우저를 재시작합니다.
+    - batch_sleep_every 페이지마다 batch_sleep 초 휴식합니다.
+    - stats()로 재시작 횟수와 메모리 샘플을 확인하여 임계치를 조정합니다.
+    """
+
+    def __init__(self, port, user_dir=CHROME_USER_DIR, restart_every=50, max_rss_mb=None,
+                 batch_sleep_every=None, batch_sleep=0, extra_args=None):
+        self.port = port
+        self.user_dir = user_dir
+        self.restart_every = restart_every
+        self.max_rss_mb = max_rss_mb
+        self.batch_sleep_every = batch_sleep_every
+        self.batch_sleep = batch_sleep
+        self.extra_args = extra_args
+        self.restarts = 0
+        self.restart_reasons = []
+        self.samples = []              # [(timestamp, pages_total, rss_mb)]
+        self.pages_total = 0
+        self.pages_since_restart = 0
+
+    @property
+    def cdp_url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self):
+        kill_chrome(self.user_dir)
+        self.pages_since_restart = 0
+        return launch_chrome(self.port, self.user_dir, self.extra_args)
+
+    def stop(self):
+        kill_chrome(self.user_dir)
+
+    def restart(self, reason):
+        print(f"♻️ [Lifecycle] 브라우저 재시작 ({reason})")
+        self.restarts += 1
+        self.restart_reasons.append(reason)
+        return self.start()
+
+    def sample(self):
+        procs = chrome_processes(self.user_dir)
+        rss_mb = sum(rss for _, rss in procs) / (1024 * 1024)
+        self.samples.append((time.time(), self.pages_total, round(rss_mb, 1)))
+        return rss_mb
+
+    def after_batch(self, n_pages):
+        """배치 종료 후 호출: 메모리 측정 -> 재시작 판단 -> 배치 휴식"""
+        before = self.pages_total
+        self.pages_total += n_pages
+        self.pages_since_restart += n_pages
+
+        rss_mb = self.sample()
+        print(f"    📈 [Lifecycle] 누적 {self.pages_total}페이지 | Chrome RSS {rss_mb:.0f}MB")
+
+        if self.max_rss_mb and rss_mb >= self.max_rss_mb:
+            self.restart(f"RSS {rss_mb:.0f}MB >= {self.max_rss_mb}MB")
+        elif self.restart_every and self.pages_since_restart >= self.restart_every:
+            self.restart(f"{self.pages_since_restart}페이지 처리")
+
+        if self.batch_sleep_every and self.pages_total // self.batch_sleep_every > before // self.batch_sleep_every:
+            print(f"    😴 [Lifecycle] {self.batch_sleep}초 휴식...")
+            time.sleep(self.batch_sleep)
+
+    def stats(self):
+        rss = [s[2] for s in self.samples]
+        return {
+            "restarts": self.restarts,
+            "restart_reasons": list(self.restart_reasons),
+            "pages_total": self.pages_total,
+            "rss_mb_max": max(rss) if rss else 0,
+            "rss_mb_last": rss[-1] if rss else 0,
+            "samples": list(self.samples),
+        }
@@ -1,13 +1,31 @@
 import json
 import time
 import os
-import subprocess
-import random
+import sys
+import argparse
+import glob
+import zlib
+import multiprocessing
 import re
+import queue
+import threading
+import requests
+from html.parser import HTMLParser
+from urllib.parse import quote, urlsplit, urlunsplit, parse_qsl, urlencode
+from requests.adapters import HTTPAdapter
 from playwright.sync_api import sync_playwright
 
 # [NEW] S2B 데이터 보강 모듈 임포트
-from data_enricher import S2B_Enricher 
+from data_enricher import S2B_Enricher, ENRICH_CONCURRENCY
+from enrich_cache import EnrichCache, normalize_model
+from s2b_mirror import S2BMirror
+from result_store import ResultStore
+from rate_limiter import RATE_LIMITER
+from snapshot_archive import SnapshotArchive, ARCHIVE_DIR
+from blob_cache import BlobCache, BLOB_CACHE_DIR, normalize_blob_url
+from chrome_lifecycle import ChromeManager, CHROME_USER_DIR
+import perf_stats
+from crawl_frontier import CrawlFrontier, product_key
 
 # ======================================================
 # [설정] 크롤링 타겟 및 운영 정책
@@ -19,81 +37,147 @@ TARGET_URLS = [
     # ... 필요한 URL 계속 추가
 ]
 
-OUTPUT_FILE = 's2b_results.json'
+OUTPUT_FILE = 's2b_results.json'          # 기존 도구 호환용 JSON (실행 종료 시 1회 생성)
+RESULT_STORE_FILE = 's2b_results.jsonl'   # 실제 결과 저장소 (append-only)
 CDP_PORT = 9222
 CDP_URL = f"http://127.0.0.1:{CDP_PORT}"
 
-# [환경] 크롬 경로
-CHROME_PATH = r"C:\Program Files\Google\Chrome\Application\chrome.exe"
-CHROME_USER_DIR = r"C:\ChromeDev"
+# [환경] 크롬 경로/프로필은 chrome_lifecycle.py에서 OS별로 결정 (CHROME_PATH, CHROME_USER_DIR)
 
-# [정책] 안정성 설정
+# [정책] 안정성 설정 (ChromeManager가 배치 단위로 적용)
 RESTART_EVERY_N = 50      
 BATCH_SLEEP_EVERY_N = 10 
 BATCH_SLEEP_DURATION = 60 
+MAX_CHROME_RSS_MB = 3000    # 크롬 프로세스 트리 RSS 합계가 넘으면 재시작 (None = 미사용)
+TAB_RECYCLE_EVERY_N = 20    # 워커 탭을 N건마다 닫고 새로 열기 (탭 단위 메모리 회수)
 
-# ======================================================
-# [모듈 1] 브라우저 생명주기 관리
-# ======================================================
-def launch_chrome():
-    print(f"🚀 [System] Chrome 실행 중... (Port: {CDP_PORT})")
-    if not os.path.exists(CHROME_PATH):
-        print(f"❌ 크롬 실행 파일을 찾을 수 없습니다: {CHROME_PATH}")
-        return False
+# [정책] 동시 수집 설정
+CRAWL_CONCURRENCY = 4       # 동시에 작업하는 탭(페이지) 수 = 전역 동시성 상한
+# 아이템 간 대기는 rate_limiter.HOST_POLICIES의 호스트별 적응형 속도 제한으로 대체
 
-    cmd = [
-        CHROME_PATH,
-        f"--remote-debugging-port={CDP_PORT}",
-        f"--user-data-dir={CHROME_USER_DIR}",
-        "--no-first-run",
-        "--no-default-browser-check",
-        "--window-size=1920,1080"
-    ]
-    try:
-        subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        time.sleep(3)
-        return True
-    except Exception as e:
-        print(f"    ❌ Chrome 실행 실패: {e}")
-        return False
+# [정책] 검색 목록 탐색 (키워드 또는 카테고리/검색 URL -> 상품 URL 자동 수집)
+SEARCH_KEYWORDS = [
+    # "전자레인지", "https://www.coupang.com/np/categories/178255"
+]
+DISCOVERY_MAX_PAGES = 3
+SEARCH_URL = "https://www.coupang.com/np/search?q={query}&page={page}"
 
-def kill_chrome():
-    print("♻️ [System] 메모리 초기화를 위해 Chrome 재시작 준비...")
-    try:
-        subprocess.run(
-            'wmic process where "name=\'chrome.exe\' and commandline like \'%ChromeDev%\'" call terminate',
-            shell=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
-        )
-        time.sleep(2)
-    except: pass
+# [정책] 멀티 프로세스 샤딩 (크롬 N개 x 프로세스 N개, 1이면 단일 프로세스)
+SHARD_COUNT = 1
+SHARD_BASE_PORT = CDP_PORT + 2          # 샤드 i는 SHARD_BASE_PORT + i 포트 사용 (CDP_PORT + 1은 보강 전용 크롬)
+SHARD_STORE_PATTERN = 's2b_results.shard{idx}.jsonl'
+SHARD_ARCHIVE_INDEX_PATTERN = 'index.shard{idx}.jsonl'
+SHARD_BLOB_INDEX_PATTERN = 'index.shard{idx}.jsonl'     # image_cache/ 안의 샤드별 인덱스
+
+# [정책] 스냅샷 보관 (True면 수집한 페이지의 DOM/JSON-LD를 snapshots/에 압축 저장 -> --reparse로 재추출)
+ARCHIVE_SNAPSHOTS = False
+
+# [정책] 이미지 캐시 (True면 브라우저가 받은 대표/상세 이미지 바이트를 image_cache/에 저장 -> 변환기가 재다운로드 없이 사용)
+# 켜면 'images' 단계에서 이미지 요청을 차단하지 않습니다.
+CACHE_IMAGES = False
+
+# [정책] HTTP 고속 경로 (브라우저 없이 HTML 직접 파싱, 필수 필드 누락 시 브라우저로 폴백)
+# CAPTURE_MODE / EXPAND_VARIANTS / CACHE_IMAGES를 켜면 브라우저 경로만 사용합니다.
+HTTP_FAST_PATH = True
+FAST_PATH_TIMEOUT = 5
+FAST_PATH_REQUIRED = ("name", "price", "image", "detail_images")
+FAST_PATH_MAX_MISSES = 5    # 연속 N건 차단/필드 누락이면 이번 실행에서는 고속 경로 중단 (브라우저만 사용)
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8",
+}
+
+# [정책] API 응답 캡처 (상품 페이지가 백그라운드로 받는 JSON에서 가격/배송/스펙/상세이미지를 채움)
+CAPTURE_MODE = False
+CAPTURE_URL_PATTERN = re.compile(
+    r"/vp/products/\d+/(items|vendoritems|vendor-items|brand-sdp)|"
+    r"/vp/products/.*(delivery|detail|content|attribute|essential|notice)|/next-api/|/vp/product-atf"
+)
+CAPTURE_WAIT_MS = 3000      # 캡처 대상 응답이 잠잠해질 때까지 최대 대기 시간
+
+# [정책] 옵션(SKU) 확장: 한 번 로드한 상품 페이지에서 모든 옵션을 개별 결과로 저장
+EXPAND_VARIANTS = False
+
+# [정책] 수집 -> 보강 파이프라인 (수집 즉시 모델명이 있는 아이템을 보강 큐로 전달, 샤딩 실행 시에는 미사용)
+ENRICH_PIPELINE = True
+ENRICH_CDP_PORT = CDP_PORT + 1          # 보강 전용 크롬 (수집/샤드 크롬과 별도 프로필/포트, 파이프라인과 Phase 2가 공유)
+ENRICH_QUEUE_SIZE = 50                  # 보강 대기 아이템 상한 (가득 차면 수집 워커가 대기 = 역압)
+ENRICH_BATCH_SIZE = 8                   # 큐에서 한 번에 꺼내 fetch_many로 처리할 아이템 수
+
+# [정책] 네트워크 요청 필터 (단계별 허용 리소스 타입, None = 필터 없음)
+ROUTE_FILTER_ENABLED = True
+ROUTE_PROFILES = {
+    # 이미지 URL 수집: 문서 + XHR/fetch (상세영역 XHR을 발생시키는 스크립트는 허용)
+    "images": {"document", "script", "xhr", "fetch"},
+    # 스펙 추출: 문서 외 전부 차단
+    "spec": {"document"},
+    "full": None,
+}
+# 단계와 무관하게 항상 차단할 광고/분석 트래커
+TRACKER_PATTERN = re.compile(
+    r"google-analytics|googletagmanager|doubleclick|googlesyndication|facebook\.(net|com)/tr|criteo|"
+    r"/beacon|/collect\?|ljc\.coupang\.com|mercury\.coupang\.com"
+)
+# 차단된 요청 1건당 절감 바이트 추정치 (응답을 받지 않으므로 실측 불가)
+EST_BYTES_BY_TYPE = {
+    "image": 80_000, "media": 500_000, "font": 40_000, "stylesheet": 30_000,
+    "script": 60_000, "xhr": 5_000, "fetch": 5_000,
+}
+EST_BYTES_DEFAULT = 2_000
 
 # ======================================================
 # [모듈 2] 데이터 정밀 추출기 (Regex & All-Table Scan)
 # ======================================================
-def extract_all_specs(page):
-    info_dict = {}
-    try:
-        rows = page.locator("table tr").all()
-        for row in rows:
-            try:
-                texts = row.locator("th, td").all_inner_texts()
-                if len(texts) >= 2:
-                    key = texts[0].strip()
-                    val = texts[1].strip()
-                    if key and val:
-                        info_dict[key] = val
-            except: continue
-    except: pass
+# 스펙 테이블(th/td 쌍)과 속성 리스트를 한 번의 evaluate로 수집 (행 수와 무관하게 왕복 1회)
+_SPECS_JS_BODY = """
+    const rows = [];
+    for (const tr of document.querySelectorAll('table tr')) {
+        const cells = tr.querySelectorAll('th, td');
+        if (cells.length >= 2) rows.push([cells[0].innerText, cells[1].innerText]);
+    }
+    const attrs = Array.from(
+        document.querySelectorAll('ul.prod-description-attribute > li'), li => li.innerText
+    );
+"""
 
-    try:
-        items = page.locator("ul.prod-description-attribute > li").all_inner_texts()
-        for item in items:
-            if ":" in item:
-                parts = item.split(":", 1)
-                info_dict[parts[0].strip()] = parts[1].strip()
-    except: pass
+# 페이지 분석에 필요한 값(JSON-LD, 본문 텍스트, 무료배송 여부, 스펙)을 한 번에 캡처
+# (page.content() 직렬화 / body.inner_text() / 스펙 추출을 각각 호출하지 않음)
+# opt.html이면 스냅샷 보관용 DOM 직렬화(outerHTML)도 같은 evaluate에서 반환
+_CAPTURE_JS = "(opt) => {" + _SPECS_JS_BODY + """
+    return {
+        json_ld: Array.from(document.querySelectorAll('script[type="application/ld+json"]'), s => s.textContent),
+        text: document.body ? document.body.innerText : '',
+        free_shipping: document.documentElement.textContent.includes('무료배송'),
+        rows, attrs,
+        html: opt && opt.html ? document.documentElement.outerHTML : null,
+    };
+}"""
+
+def specs_from_rows(rows, attrs):
+    """(키, 값) 행 목록과 '키: 값' 속성 목록을 스펙 dict로 정리합니다."""
+    info_dict = {}
+    for texts in rows:
+        if len(texts) >= 2:
+            key = (texts[0] or "").strip()
+            val = (texts[1] or "").strip()
+            if key and val:
+                info_dict[key] = val
+    for item in attrs:
+        if ":" in item:
+            parts = item.split(":", 1)
+            info_dict[parts[0].strip()] = parts[1].strip()
     return info_dict
 
+def capture_page(page, with_html=False):
+    """
+    페이지 스냅샷 1회 캡처: {"json_ld": [...], "text", "free_shipping", "rows", "attrs", "html"}
+    브라우저 경로와 HTML 고속 경로(RawPageParser.snapshot)가 같은 구조를 만들어 build_item_from_snapshot을 공유합니다.
+    with_html=True면 "html"에 렌더링된 DOM(outerHTML)을 담습니다 (스냅샷 보관 시에만 사용, 그 외에는 None).
+    """
+    with perf_stats.timed("page.capture"):
+        return page.evaluate(_CAPTURE_JS, {"html": with_html})
+
 def extract_kc_by_regex(text):
     patterns = [
         r"[A-Z]{2}[0-9]{4,5}-[0-9]{4,5}[A-Z]?",
@@ -114,182 +198,1233 @@ def get_best_value(info_dict, keywords, default_val=""):
                 return val
     return default_val
 
-# [NEW] 상세 이미지 추출 함수 (버튼 클릭 + 스크롤)
+def new_item(url):
+    return {
+        "url": url, "name": "N/A", "price": 0, "image": "", 
+        "kc": "상세설명참조", "maker": "협력업체", "origin": "중국", "model": "",
+        "g2b_code": "", "category": "기타",
+        "detail_images": [] 
+    }
+
+def apply_json_ld(item, json_text):
+    """JSON-LD(Product) 텍스트에서 상품명/대표이미지/가격을 채웁니다."""
+    data = json.loads(json_text)
+    if isinstance(data, list): data = data[0]
+    item["name"] = data.get("name", "N/A")
+    item["image"] = data.get("image", "")
+    if isinstance(item["image"], list): item["image"] = item["image"][0]
+    offers = data.get("offers", {})
+    if isinstance(offers, list): offers = offers[0]
+    item["price"] = int(offers.get("price", 0))
+
+def apply_specs(item, all_specs, full_text):
+    """스펙 테이블과 본문 텍스트로 모델명/제조사/원산지/KC를 채웁니다."""
+    model = get_best_value(all_specs, ["모델명", "모델번호", "품명"], "")
+    if not model:
+        match = re.search(r"\(([A-Za-z0-9-]{5,})\)", item["name"])
+        if match: model = match.group(1)
+    item["model"] = model
+
+    item["maker"] = get_best_value(all_specs, ["제조자", "수입자", "판매업자", "제조사"], "협력업체")
+    item["origin"] = get_best_value(all_specs, ["제조국", "원산지", "국가"], "중국")
+
+    kc_regex = extract_kc_by_regex(full_text)
+    if kc_regex: item["kc"] = kc_regex
+
+def overlay_api(snap, api):
+    """
+    페이지 스냅샷에 API 응답 값(스펙 행, 무료배송 여부)을 덧씌운 사본 (원본 스냅샷은 그대로 보관용으로 유지)
+    API 스펙 행은 DOM에 없는 키만 채움 (같은 키는 페이지에 표시된 DOM 값 우선)
+    """
+    if not api: return snap
+    merged = dict(snap, rows=(api.get("rows") or []) + (snap.get("rows") or []))
+    if api.get("free_shipping") is not None: merged["free_shipping"] = api["free_shipping"]
+    return merged
+
+def shipping_fee(snap):
+    """무료배송이 아니면 배송비 3000원을 가격에 가산"""
+    return 0 if snap.get("free_shipping") else 3000
+
+def build_item_from_snapshot(url, snap, api=None):
+    """페이지 스냅샷(메모리)만으로 item을 구성합니다. api(캡처 모드 응답 값)가 있으면 가격/배송/스펙에 반영합니다."""
+    snap = overlay_api(snap, api)
+    item = new_item(url)
+    # Product 타입 JSON-LD 우선, 없으면 파싱되는 첫 블록
+    json_lds = sorted(snap.get("json_ld") or [], key=lambda t: '"Product"' not in t)
+    for json_text in json_lds:
+        try:
+            apply_json_ld(item, json_text)
+            break
+        except: continue
+
+    if api and api.get("price"): item["price"] = api["price"]
+    item["price"] += shipping_fee(snap)
+    apply_specs(item, specs_from_rows(snap.get("rows") or [], snap.get("attrs") or []), snap.get("text") or "")
+    return item
+
+# [NEW] 상세 이미지 추출 (버튼 클릭 + 이벤트 기반 스크롤 + 일괄 수집을 evaluate 1회로 처리)
+# - 고정 sleep 대신 MutationObserver로 DOM 변화가 잠잠해질 때까지만 대기
+# - 수집된 이미지 수가 연속 N회 변하지 않으면 즉시 종료
+_HARVEST_JS = """async (opt) => {
+    const started = Date.now();
+    const roots = () => {
+        const found = document.querySelectorAll('#productDetail, .product-detail-content-border, #vendorInventory');
+        return found.length ? Array.from(found) : [document.body];
+    };
+    const collect = () => {
+        const out = [];
+        for (const root of roots()) {
+            for (const img of root.querySelectorAll('img')) {
+                const src = img.getAttribute('src') || img.getAttribute('data-src');
+                if (src && src.includes('http') && !src.includes('.gif') && !src.includes('blank') && !out.includes(src)) out.push(src);
+            }
+        }
+        return out;
+    };
+    const quiet = () => new Promise((resolve) => {
+        let idle;
+        const done = () => { observer.disconnect(); clearTimeout(idle); clearTimeout(cap); resolve(); };
+        const observer = new MutationObserver(() => { clearTimeout(idle); idle = setTimeout(done, opt.settleMs); });
+        observer.observe(document.body, {subtree: true, childList: true, attributes: true, attributeFilter: ['src', 'data-src']});
+        idle = setTimeout(done, opt.settleMs);
+        const cap = setTimeout(done, opt.settleMs * 8);
+    });
+
+    // 1. '상품정보 더보기' 버튼 클릭
+    let clicked = false;
+    for (const el of document.querySelectorAll('button, a')) {
+        if (/상품정보|더보기|펼치기/.test(el.innerText || '') && el.offsetParent !== null) {
+            el.click(); clicked = true; break;
+        }
+    }
+    if (clicked) await quiet();
+
+    // 2. 스크롤 (이미지 수가 안정될 때까지)
+    let last = collect().length, stable = 0, y = 0;
+    while (stable < opt.stableRounds && y < opt.maxScroll && Date.now() - started < opt.maxMs) {
+        y += window.innerHeight * 2;
+        window.scrollTo(0, y);
+        await quiet();
+        const count = collect().length;
+        const atBottom = y >= document.body.scrollHeight;
+        if (count === last) stable += atBottom ? opt.stableRounds : 1;
+        else { stable = 0; last = count; }
+    }
+
+    // 3. 이미지 URL 일괄 추출
+    return {clicked, images: collect(), scrolled: y, elapsed: Date.now() - started};
+}"""
+
+HARVEST_OPTIONS = {
+    "settleMs": 250,       # DOM 변화가 없으면 안정된 것으로 간주 (ms)
+    "stableRounds": 3,     # 이미지 수가 연속 N회 동일하면 종료
+    "maxScroll": 30000,
+    "maxMs": 15000,
+}
+
 def get_detail_images_with_scroll(page):
     print("    📜 [System] 상세 이미지 확보 시작...")
-    
-    # 1. '상품정보 더보기' 버튼 클릭
-    try:
-        more_btns = page.locator("button, a").filter(has_text=re.compile(r"상품정보|더보기|펼치기")).all()
-        clicked = False
-        for btn in more_btns:
-            if btn.is_visible():
-                btn.click(force=True)
-                clicked = True
-                break
-        if clicked:
-            print("    🖱️ '상품정보 더보기' 버튼 클릭 성공")
-            time.sleep(2)
-    except: pass
-
-    # 2. 스크롤 다운 (Lazy Loading 유도)
     try:
-        page.evaluate("""async () => {
-            await new Promise((resolve) => {
-                let totalHeight = 0;
-                const distance = 300;
-                const timer = setInterval(() => {
-                    const scrollHeight = document.body.scrollHeight;
-                    window.scrollBy(0, distance);
-                    totalHeight += distance;
-                    if(totalHeight >= scrollHeight || totalHeight > 30000){
-                        clearInterval(timer);
-                        resolve();
-                    }
-                }, 100);
-            });
-        }""")
-        time.sleep(2)
-    except: pass
-
-    # 3. 이미지 URL 추출
-    detail_images = []
-    try:
-        # 주요 컨테이너 탐색
-        containers = page.locator("#productDetail, .product-detail-content-border, #vendorInventory").all()
-        if not containers:
-            # 컨테이너를 못 찾으면 바디 전체에서 검색 (차선책)
-            containers = [page.locator("body")]
-
-        for cont in containers:
-            imgs = cont.locator("img").all()
-            for img in imgs:
-                src = img.get_attribute("src") or img.get_attribute("data-src")
-                if src and "http" in src and ".gif" not in src and "blank" not in src:
-                    if src not in detail_images:
-                        detail_images.append(src)
+        with perf_stats.timed("images.harvest"):
+            result = page.evaluate(_HARVEST_JS, HARVEST_OPTIONS)
     except Exception as e:
         print(f"    ⚠️ 이미지 추출 중 에러: {e}")
-        
-    return detail_images
+        return []
+
+    if result.get("clicked"): print("    🖱️ '상품정보 더보기' 버튼 클릭 성공")
+    print(f"    ⏱️ 스크롤 {result.get('scrolled', 0)}px / {result.get('elapsed', 0)}ms")
+    return result.get("images", [])
+
+# ======================================================
+# [모듈 3] 네트워크 요청 필터 (Route Interception)
+# ======================================================
+class RouteFilter:
+    """
+    페이지 단위 요청 차단기.
+    - set_stage()로 단계별 프로필(ROUTE_PROFILES)을 전환하며, 트래커는 항상 차단합니다.
+    - take_report()로 페이지별 차단 건수와 추정 절감 바이트를 가져옵니다.
+    """
+    def __init__(self, stage="images", allow_images=False):
+        self.stage = stage
+        self.allow_images = allow_images   # 이미지 캐시 사용 시 'images' 단계에서 이미지 허용
+        self._reset()
+
+    def _reset(self):
+        self.blocked = {}
+        self.bytes_saved = 0
+
+    def install(self, page):
+        page.route("**/*", self._handle)
+
+    def set_stage(self, stage):
+        self.stage = stage
+
+    def _handle(self, route):
+        req = route.request
+        allow = ROUTE_PROFILES.get(self.stage)
+        if allow is not None and self.allow_images and self.stage == "images":
+            allow = allow | {"image"}
+        if allow is not None:
+            rtype = req.resource_type
+            if rtype not in allow or TRACKER_PATTERN.search(req.url):
+                self.blocked[rtype] = self.blocked.get(rtype, 0) + 1
+                self.bytes_saved += EST_BYTES_BY_TYPE.get(rtype, EST_BYTES_DEFAULT)
+                try: route.abort()
+                except: pass
+                return
+        try: route.continue_()
+        except: pass
+
+    def take_report(self):
+        report = {"blocked": dict(self.blocked), "total": sum(self.blocked.values()), "bytes_saved": self.bytes_saved}
+        self._reset()
+        return report
+
+# ======================================================
+# [모듈 3-1] API 응답 캡처 (XHR/JSON)
+# ======================================================
+_PRICE_KEYS = ("finalPrice", "salePrice", "couponPrice", "discountedPrice", "price")
+_FREE_SHIP_KEYS = ("freeShipping", "isFreeShipping", "freeDelivery")
+_SHIP_FEE_KEYS = ("deliveryFee", "shippingFee", "deliveryCharge")
+_ATTR_NAME_KEYS = ("title", "attributeName", "name", "key", "label")
+_ATTR_VALUE_KEYS = ("description", "attributeValue", "value", "content")
+_DETAIL_KEY_HINT = re.compile(r"detail|content|description", re.I)
+_IMG_URL = re.compile(r"(?:https?:)?//[^\s\"'<>]+?\.(?:jpe?g|png|webp)(?:\?[^\s\"'<>]*)?", re.I)
+
+def _to_int(val):
+    if isinstance(val, bool): return None
+    if isinstance(val, (int, float)): return int(val)
+    if isinstance(val, str):
+        digits = re.sub(r"[^\d]", "", val)
+        return int(digits) if digits else None
+    return None
+
+def _walk(obj, path=""):
+    """JSON 트리의 모든 (경로, dict) 쌍을 순회"""
+    if isinstance(obj, dict):
+        yield path, obj
+        for k, v in obj.items(): yield from _walk(v, f"{path}/{k}")
+    elif isinstance(obj, list):
+        for v in obj: yield from _walk(v, path)
+
+def _own_items_api(url, product_id):
+    """이 상품(product_id)의 옵션/판매자 아이템 API 응답인지"""
+    return re.search(rf"/vp/products/{product_id}/(items|vendoritems|vendor-items)", url or "") is not None
+
+def _node_owner(node, product_id, vendor_item_id):
+    """노드 자체의 식별자로 소속 판정: "own"(크롤링 중인 상품) / "other"(추천/다른 옵션 등) / None(식별자 없음)"""
+    vid, pid = node.get("vendorItemId"), node.get("productId")
+    if vendor_item_id and vid not in (None, "") and not isinstance(vid, (dict, list)):
+        return "own" if str(vid) == vendor_item_id else "other"
+    if pid not in (None, "") and not isinstance(pid, (dict, list)):
+        if str(pid) != product_id: return "other"
+        # productId만 같고 vendorItemId가 없으면(또는 URL에 vendorItemId가 없으면) 이 상품으로 간주
+        return "own" if vid in (None, "") or not vendor_item_id else None
+    return None
+
+def _walk_own(data, product_id, vendor_item_id, own_api):
+    """
+    JSON 트리에서 이 상품에 속한 (경로, dict)만 순회합니다.
+    식별자가 없는 노드는 가장 가까운 상위 노드의 소속을 따르고, 최상위까지 없으면 이 상품의 아이템 API 응답일 때만 포함
+    """
+    def visit(obj, path, owner):
+        if isinstance(obj, dict):
+            owner = _node_owner(obj, product_id, vendor_item_id) or owner
+            if owner == "own": yield path, obj
+            for k, v in obj.items(): yield from visit(v, f"{path}/{k}", owner)
+        elif isinstance(obj, list):
+            for v in obj: yield from visit(v, path, owner)
+    yield from visit(data, "", "own" if own_api else None)
+
+def parse_api_payloads(payloads, url):
+    """
+    캡처된 JSON 응답들에서 item 필드를 추출합니다. (응답 스키마가 바뀌어도 동작하도록 키 이름 기반 탐색)
+    - 크롤링 중인 URL의 vendorItemId(없으면 productId)와 일치하는 노드, 또는 이 상품의 아이템 API 응답만 사용
+      (추천/광고/다른 옵션 위젯의 가격·배송·스펙이 섞이지 않도록. 못 찾으면 price=None -> JSON-LD 가격 유지)
+    반환: {"price": int|None, "free_shipping": bool|None, "rows": [[키, 값]], "detail_images": [url]}
+    """
+    match = re.search(r"/vp/products/(\d+)", url)
+    vid_match = re.search(r"vendorItemId=(\d+)", url)
+    product_id = match.group(1) if match else ""
+    vendor_item_id = vid_match.group(1) if vid_match else ""
+    found = {"price": None, "free_shipping": None, "rows": [], "detail_images": []}
+    if not product_id: return found
+    for payload_url, data in payloads:
+        for path, node in _walk_own(data, product_id, vendor_item_id, _own_items_api(payload_url, product_id)):
+            if found["price"] is None:
+                for key in _PRICE_KEYS:
+                    price = _to_int(node.get(key))
+                    if price: found["price"] = price; break
+
+            if found["free_shipping"] is None:
+                for key in _FREE_SHIP_KEYS:
+                    if isinstance(node.get(key), bool): found["free_shipping"] = node[key]; break
+                else:
+                    for key in _SHIP_FEE_KEYS:
+                        fee = _to_int(node.get(key))
+                        if fee is not None: found["free_shipping"] = fee == 0; break
+
+            name = next((node[k] for k in _ATTR_NAME_KEYS if isinstance(node.get(k), str)), None)
+            value = next((node[k] for k in _ATTR_VALUE_KEYS if isinstance(node.get(k), str)), None)
+            if name and value and name != value and len(value) < 200:
+                found["rows"].append([name, value])
+
+            for key, val in node.items():
+                if isinstance(val, str) and _DETAIL_KEY_HINT.search(f"{path}/{key}"):
+                    for src in _IMG_URL.findall(val):
+                        if src.startswith("//"): src = "https:" + src
+                        if ".gif" not in src and "blank" not in src and src not in found["detail_images"]:
+                            found["detail_images"].append(src)
+    return found
+
+class ResponseCapture:
+    """
+    page.on("response")로 상품 API(JSON) 응답을 모읍니다.
+    - 핸들러에서는 응답 객체만 보관하고, 본문(json)은 분석 시점에 읽습니다.
+    - begin()으로 아이템마다 초기화합니다.
+    """
+    def __init__(self, pattern=CAPTURE_URL_PATTERN):
+        self.pattern = pattern
+        self._responses = []
+        self._last_seen = 0.0
+
+    def install(self, page):
+        page.on("response", self._on_response)
+
+    def begin(self):
+        self._responses = []
+        self._last_seen = time.time()
+
+    def _on_response(self, response):
+        try:
+            if response.request.resource_type not in ("xhr", "fetch"): return
+            if not self.pattern.search(response.url): return
+            if "json" not in (response.headers.get("content-type") or ""): return
+            self._responses.append(response)
+            self._last_seen = time.time()
+        except: pass
+
+    def wait_quiet(self, page, quiet_ms=500, max_ms=CAPTURE_WAIT_MS):
+        """캡처 대상 응답이 quiet_ms 동안 추가로 오지 않거나 max_ms가 지나면 반환"""
+        deadline = time.time() + max_ms / 1000
+        while time.time() < deadline:
+            if self._responses and time.time() - self._last_seen >= quiet_ms / 1000: break
+            page.wait_for_timeout(100)
+
+    def payloads(self):
+        out = []
+        for response in self._responses:
+            try: out.append((response.url, response.json()))
+            except: continue
+        return out
+
+class ImageCapture:
+    """
+    page.on("response")로 브라우저가 받은 이미지 응답을 모아 BlobCache에 저장합니다.
+    - 핸들러에서는 응답 객체만 보관하고, 본문은 아이템 처리 후 flush()에서 읽습니다.
+    - 수집 결과(대표/상세 이미지)에 포함된 URL만 저장합니다 (아이콘/배너 제외).
+    """
+    def __init__(self, cache):
+        self.cache = cache
+        self._responses = {}
+
+    def install(self, page):
+        page.on("response", self._on_response)
+
+    def begin(self):
+        self._responses = {}
+
+    def _on_response(self, response):
+        try:
+            if response.request.resource_type != "image" or response.status != 200: return
+            self._responses[normalize_blob_url(response.url)] = response
+        except: pass
+
+    def flush(self, records):
+        """records(crawl_item 결과)의 이미지 URL 중 이번 페이지에서 받은 것을 캐시에 저장하고 건수를 반환"""
+        wanted = []
+        for record in records:
+            wanted += [record.get("image")] + list(record.get("detail_images") or [])
+
+        saved = 0
+        with perf_stats.timed("images.cache"):
+            for url in dict.fromkeys(filter(None, wanted)):
+                response = self._responses.get(normalize_blob_url(url))
+                if response is None or url in self.cache: continue
+                try:
+                    self.cache.put(url, response.body(), response.headers.get("content-type"))
+                    saved += 1
+                except: continue
+        self._responses = {}
+        return saved
+
+# ======================================================
+# [모듈 3-2] 옵션(SKU) 확장
+# ======================================================
+# 옵션 선택 영역 안의 itemId/vendorItemId 요소만 한 번에 수집
+# (추천/다른 판매자 위젯에도 같은 속성이 있으므로 페이지 전체를 검색하지 않음)
+_OPTION_CONTAINER_SELECTOR = (
+    ".prod-option, .prod-option-container, #prodOption, #optionContainer, .option-table-list, "
+    "[class*='option-picker'], [class*='OptionPicker'], [class*='option-selector']"
+)
+_VARIANTS_JS = """(opt) => {
+    const out = [];
+    const seen = new Set();
+    for (const root of document.querySelectorAll(opt.containers)) {
+      for (const el of root.querySelectorAll('[data-vendor-item-id], [data-vendoritemid]')) {
+        if (seen.has(el)) continue;
+        seen.add(el);
+        const pid = el.getAttribute('data-product-id') || el.getAttribute('data-productid');
+        if (pid && pid !== opt.productId) continue;
+        const img = el.querySelector('img');
+        const priceEl = el.querySelector('[class*="price"]');
+        out.push({
+            vendor_item_id: el.getAttribute('data-vendor-item-id') || el.getAttribute('data-vendoritemid') || '',
+            item_id: el.getAttribute('data-item-id') || el.getAttribute('data-itemid') || '',
+            name: (el.getAttribute('data-title') || el.innerText || '').trim().slice(0, 200),
+            price: priceEl ? priceEl.innerText : '',
+            image: img ? (img.getAttribute('src') || img.getAttribute('data-src') || '') : '',
+        });
+      }
+    }
+    return out;
+}"""
+_VARIANT_NAME_KEYS = ("optionName", "itemName", "vendorItemName", "name", "title")
+_VARIANT_IMAGE_KEYS = ("imageUrl", "thumbnailUrl", "thumbnail", "image")
+_OPTION_PATH_HINT = re.compile(r"option|sku|attributeVendorItem", re.I)
+
+def variants_from_payloads(payloads, product_id):
+    """
+    API 응답에서 이 상품(product_id)의 옵션 노드만 추출합니다.
+    - 노드에 productId가 있으면 일치해야 하고, 없으면 옵션 하위 경로(option/sku)이거나 이 상품의 옵션 API 응답이어야 함
+      (추천/다른 판매자 응답의 vendorItemId는 제외)
+    """
+    out = []
+    for url, data in payloads:
+        own_items_api = _own_items_api(url, product_id)
+        for path, node in _walk(data):
+            vid = node.get("vendorItemId")
+            if not vid or isinstance(vid, (dict, list)): continue
+            pid = node.get("productId")
+            if pid not in (None, ""):
+                if str(pid) != product_id: continue
+            elif not (own_items_api or _OPTION_PATH_HINT.search(path)): continue
+            name = next((node[k] for k in _VARIANT_NAME_KEYS if isinstance(node.get(k), str)), "")
+            price = next((node[k] for k in _PRICE_KEYS if _to_int(node.get(k))), "")
+            image = next((node[k] for k in _VARIANT_IMAGE_KEYS if isinstance(node.get(k), str)), "")
+            out.append({"vendor_item_id": str(vid), "item_id": str(node.get("itemId") or ""),
+                        "name": name, "price": price, "image": image})
+    return out
+
+def extract_variants(page, url, payloads=None):
+    """옵션 선택 영역(DOM) + (캡처 모드라면) API 응답에서 이 상품의 옵션을 모아 vendorItemId 기준으로 중복 제거"""
+    match = re.search(r"/vp/products/(\d+)", url)
+    if not match: return []
+    product_id = match.group(1)
+    try:
+        with perf_stats.timed("variants.evaluate"):
+            found = page.evaluate(_VARIANTS_JS, {"containers": _OPTION_CONTAINER_SELECTOR, "productId": product_id})
+    except: found = []
+    found += variants_from_payloads(payloads or [], product_id)
+
+    merged = {}
+    for v in found:
+        vid = v.get("vendor_item_id")
+        if not vid: continue
+        cur = merged.setdefault(vid, dict(v))
+        for field in ("item_id", "name", "price", "image"):
+            if not cur.get(field) and v.get(field): cur[field] = v[field]
+    return list(merged.values())
+
+def expand_variants(item, variants, shipping_fee):
+    """기본 item을 복제하여 옵션별 결과 레코드를 만듭니다 (URL의 옵션은 기본 item이 담당)."""
+    match = re.search(r"/vp/products/(\d+)", item["url"])
+    if not match: return []
+    base_vid = re.search(r"vendorItemId=(\d+)", item["url"])
+    base_vid = base_vid.group(1) if base_vid else None
+
+    records = []
+    for v in variants:
+        if v["vendor_item_id"] == base_vid: continue
+        record = json.loads(json.dumps(item))
+        query = urlencode([(k, val) for k, val in (("itemId", v.get("item_id")), ("vendorItemId", v["vendor_item_id"])) if val])
+        record["url"] = f"https://www.coupang.com/vp/products/{match.group(1)}?{query}"
+        option_name = (v.get("name") or "").split("\n")[0].strip()
+        if option_name and option_name not in record["name"]:
+            record["name"] = f"{record['name']} {option_name}"
+        price = _to_int(v.get("price"))
+        if price: record["price"] = price + shipping_fee
+        if v.get("image"):
+            record["image"] = "https:" + v["image"] if v["image"].startswith("//") else v["image"]
+        records.append(record)
+    return records
 
 # ======================================================
 # [핵심] 크롤링 로직 (Phase 1 전용)
 # ======================================================
-def crawl_item(page, url): 
+def crawl_item(page, url, route_filter=None, archive=None, response_capture=None, expand=False): 
+    """상품 1건 수집. expand=True면 [기본 item, 옵션 item...] 리스트를 반환합니다."""
     print(f"▶ 이동: {url[:60]}...")
+    if route_filter: route_filter.set_stage("images")
+    if response_capture: response_capture.begin()
+    RATE_LIMITER.acquire(url)
+    response = None
     try:
-        page.goto(url, wait_until="domcontentloaded", timeout=10000)
-    except: pass 
-
-    item = {
-        "url": url, "name": "N/A", "price": 0, "image": "", 
-        "kc": "상세설명참조", "maker": "협력업체", "origin": "중국", "model": "",
-        "g2b_code": "", "category": "기타",
-        "detail_images": [] 
-    }
+        response = page.goto(url, wait_until="domcontentloaded", timeout=10000)
+    except Exception as e:
+        RATE_LIMITER.failure(url, "timeout" if "Timeout" in str(e) else "goto-error")
 
     try:
         if "/login/" in page.url:
+            RATE_LIMITER.failure(url, "login")
             print("    ⚠️ 로그인 필요 페이지 -> 건너뜀")
             return None
+        if response is not None:
+            if response.status >= 400: RATE_LIMITER.failure(url, f"HTTP {response.status}")
+            else: RATE_LIMITER.success(url)
 
-        # JSON-LD 파싱
-        try:
-            json_data = page.locator('script[type="application/ld+json"]').first.inner_text()
-            data = json.loads(json_data)
-            if isinstance(data, list): data = data[0]
-            item["name"] = data.get("name", "N/A")
-            item["image"] = data.get("image", "")
-            if isinstance(item["image"], list): item["image"] = item["image"][0]
-            offers = data.get("offers", {})
-            if isinstance(offers, list): offers = offers[0]
-            item["price"] = int(offers.get("price", 0))
-        except: pass
+        # API 응답 캡처 모드: 백그라운드 JSON에서 가격/배송/스펙/상세이미지 확보
+        api = None
+        payloads = []
+        if response_capture:
+            response_capture.wait_quiet(page)
+            payloads = response_capture.payloads()
+            with perf_stats.timed("capture.parse"):
+                api = parse_api_payloads(payloads, url)
+            print(f"    📡 API 응답 {len(payloads)}건 | 스펙 {len(api['rows'])}개 | 상세이미지 {len(api['detail_images'])}장")
 
-        content = page.content()
-        if "무료배송" not in content: item["price"] += 3000
+        # [NEW] 상세 이미지 추출 실행 (API에서 확보했으면 스크롤 생략)
+        if api and api["detail_images"]:
+            detail_images = api["detail_images"]
+        else:
+            detail_images = get_detail_images_with_scroll(page)
+        print(f"    📸 상세 이미지 {len(detail_images)}장 확보")
 
-        # [NEW] 상세 이미지 추출 실행
-        item["detail_images"] = get_detail_images_with_scroll(page)
-        print(f"    📸 상세 이미지 {len(item['detail_images'])}장 확보")
+        # 이미지 URL 확보 이후에는 문서 외 추가 요청을 모두 차단
+        if route_filter: route_filter.set_stage("spec")
 
-        # 정밀 스펙 추출
-        full_text = page.locator("body").inner_text()
-        all_specs = extract_all_specs(page)
-        
-        model = get_best_value(all_specs, ["모델명", "모델번호", "품명"], "")
-        if not model:
-            match = re.search(r"\(([A-Za-z0-9-]{5,})\)", item["name"])
-            if match: model = match.group(1)
-        item["model"] = model
+        # 페이지 1회 캡처 -> 배송비/스펙/KC 추출은 모두 메모리에서 처리 (보관 시 DOM 직렬화도 같은 evaluate에서)
+        snap = capture_page(page, with_html=archive is not None)
+        html = snap.pop("html", None)
+        api_values = {k: api[k] for k in ("price", "free_shipping", "rows")} if api else None
+        item = build_item_from_snapshot(url, snap, api_values)
+        item["detail_images"] = detail_images
 
-        item["maker"] = get_best_value(all_specs, ["제조자", "수입자", "판매업자", "제조사"], "협력업체")
-        item["origin"] = get_best_value(all_specs, ["제조국", "원산지", "국가"], "중국")
+        # 옵션(SKU) 확장: 추가 페이지 로드 없이 옵션별 레코드 생성
+        variant_items = []
+        if expand:
+            fee = shipping_fee(overlay_api(snap, api_values))
+            variant_items = expand_variants(item, extract_variants(page, url, payloads), fee)
+            if variant_items: print(f"    🧬 옵션 {len(variant_items)}개 추가 레코드 생성")
 
-        kc_regex = extract_kc_by_regex(full_text)
-        if kc_regex: item["kc"] = kc_regex
+        # DOM 원본 + 캡처 결과 + API 응답 값을 함께 보관 -> --reparse는 DOM에서 다시 추출
+        if archive:
+            try: archive.save(url, html, capture=snap, detail_images=detail_images, api=api_values)
+            except Exception as e: print(f"    ⚠️ 스냅샷 저장 실패: {e}")
 
     except Exception as e:
         print(f"   ⚠️ 파싱 에러: {e}")
         return None
 
     print(f"   ✅ 쿠팡 수집 완료: {item['name'][:10]}... | 모델:{item['model']}")
+    return [item] + variant_items if expand else item
+
+# ======================================================
+# [고속 경로] 브라우저 없이 HTML 직접 파싱
+# ======================================================
+_VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+_DETAIL_CONTAINER_IDS = {"productDetail", "vendorInventory"}
+_DETAIL_CONTAINER_CLASSES = {"product-detail-content-border"}
+
+class RawPageParser(HTMLParser):
+    """
+    원본 HTML 1회 순회로 JSON-LD, 스펙 테이블 행, 속성 리스트, 본문 텍스트, 상세 이미지 URL을 수집합니다.
+    (브라우저 렌더링 결과와 동일한 구조로 정리하여 추출 로직을 공유)
+    """
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.json_ld = []
+        self.rows = []
+        self.attr_items = []
+        self.detail_images = []
+        self._text = []
+        self._skip = None          # script/style 내부 여부
+        self._ld_buf = None
+        self._row = None
+        self._cell = None
+        self._li = None
+        self._stack = []           # 열린 태그 [tag, 역할] (역할: "detail" 상세 컨테이너 / "attr" 속성 ul / "attr_li" 속성 항목)
+        self._detail_depth = 0     # 스택 안의 상세 이미지 컨테이너 수
+
+    def _pop_to(self, tag):
+        """tag와 짝이 맞는 열린 태그까지 스택을 닫습니다 (닫는 태그가 생략된 하위 태그도 함께 정리)."""
+        if not any(entry[0] == tag for entry in self._stack): return
+        while self._stack:
+            entry = self._stack.pop()
+            if entry[1] == "detail": self._detail_depth -= 1
+            elif entry[1] == "attr_li" and self._li is not None:
+                self.attr_items.append("".join(self._li).strip())
+                self._li = None
+            if entry[0] == tag: break
+
+    def _close_row(self):
+        """열린 셀/행 마무리 (</td>, </tr>이 생략된 표 대응)"""
+        if self._cell is not None:
+            self._row.append("".join(self._cell).strip())
+            self._cell = None
+        if self._row is not None:
+            self.rows.append(self._row)
+            self._row = None
+
+    def handle_starttag(self, tag, attrs):
+        a = dict(attrs)
+        classes = set((a.get("class") or "").split())
+
+        if tag in ("script", "style", "noscript"):
+            self._skip = tag
+            if tag == "script" and a.get("type") == "application/ld+json":
+                self._ld_buf = []
+            return
+
+        if tag not in _VOID_TAGS:
+            # 닫히지 않은 <li> 다음의 <li>는 이전 항목을 암묵적으로 닫음
+            if tag == "li" and self._stack and self._stack[-1][0] == "li": self._pop_to("li")
+            role = None
+            if a.get("id") in _DETAIL_CONTAINER_IDS or classes & _DETAIL_CONTAINER_CLASSES:
+                role = "detail"
+                self._detail_depth += 1
+            elif tag == "ul" and "prod-description-attribute" in classes:
+                role = "attr"
+            elif tag == "li" and self._stack and self._stack[-1][1] == "attr":
+                role = "attr_li"
+                self._li = []
+            self._stack.append([tag, role])
+
+        if tag == "tr":
+            self._close_row()
+            self._row = []
+        elif tag in ("th", "td") and self._row is not None:
+            if self._cell is not None: self._row.append("".join(self._cell).strip())
+            self._cell = []
+        elif tag == "img" and self._detail_depth:
+            src = a.get("src") or a.get("data-src")
+            if src and src.startswith("//"): src = "https:" + src
+            if src and "http" in src and ".gif" not in src and "blank" not in src and src not in self.detail_images:
+                self.detail_images.append(src)
+        elif tag in ("br", "p", "div", "li"):
+            self._text.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag == self._skip:
+            if self._ld_buf is not None:
+                self.json_ld.append("".join(self._ld_buf))
+                self._ld_buf = None
+            self._skip = None
+            return
+
+        if tag in ("th", "td") and self._cell is not None:
+            self._row.append("".join(self._cell).strip())
+            self._cell = None
+        elif tag in ("tr", "table"):
+            self._close_row()
+
+        if tag not in _VOID_TAGS: self._pop_to(tag)
+
+    def handle_data(self, data):
+        if self._skip:
+            if self._ld_buf is not None: self._ld_buf.append(data)
+            return
+        self._text.append(data)
+        if self._cell is not None: self._cell.append(data)
+        if self._li is not None: self._li.append(data)
+
+    @property
+    def text(self):
+        return "".join(self._text)
+
+    def snapshot(self, html):
+        """capture_page()와 같은 구조의 페이지 스냅샷"""
+        return {
+            "json_ld": self.json_ld, "text": self.text, "free_shipping": "무료배송" in html,
+            "rows": self.rows, "attrs": self.attr_items,
+        }
+
+def snapshot_from_html(html):
+    """원본 HTML -> (capture_page()와 같은 구조의 스냅샷, 상세 이미지 URL 목록)"""
+    parsed = RawPageParser()
+    parsed.feed(html)
+    parsed.close()
+    return parsed.snapshot(html), parsed.detail_images
+
+def build_item_from_html(url, html, api=None):
+    """원본 HTML 문자열만으로 item을 구성합니다 (브라우저 불필요)."""
+    snap, detail_images = snapshot_from_html(html)
+    item = build_item_from_snapshot(url, snap, api)
+    item["detail_images"] = detail_images
     return item
 
+_http = requests.Session()
+_http.headers.update(HTTP_HEADERS)
+_http.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=CRAWL_CONCURRENCY * 2))
+
+_fast_path_lock = threading.Lock()
+_fast_path_misses = 0
+
+def fast_path_enabled():
+    """옵션 확장/API 캡처/이미지 캐시는 브라우저 경로에서만 동작하므로 켜져 있으면 고속 경로를 쓰지 않음"""
+    if EXPAND_VARIANTS or CAPTURE_MODE or CACHE_IMAGES: return False
+    return HTTP_FAST_PATH and _fast_path_misses < FAST_PATH_MAX_MISSES
+
+def _fast_path_miss(url, reason):
+    """
+    고속 경로 실패 기록: 연속 실패가 쌓이면 고속 경로를 끕니다.
+    (이미 보낸 요청이므로 토큰은 되돌리지 않음 -> 브라우저 재시도는 별도 토큰으로 속도 제한을 받음)
+    """
+    global _fast_path_misses
+    with _fast_path_lock:
+        _fast_path_misses += 1
+        if _fast_path_misses == FAST_PATH_MAX_MISSES:
+            print(f"    🚫 [FastPath] 연속 {FAST_PATH_MAX_MISSES}건 실패 ({reason}) -> 이번 실행은 브라우저 경로만 사용")
+
+def crawl_item_http(url, archive=None):
+    """
+    HTTP 고속 경로. 필수 필드(FAST_PATH_REQUIRED, 상세 이미지 포함)가 모두 채워진 경우에만 item을 반환하고,
+    로그인 리다이렉트/차단/필드 누락 시 None을 반환하여 브라우저 경로로 넘깁니다.
+    """
+    global _fast_path_misses
+    started = time.time()
+    RATE_LIMITER.acquire(url)
+    try:
+        resp = _http.get(url if url.startswith("http") else f"https://{url}", timeout=FAST_PATH_TIMEOUT)
+    except Exception:
+        RATE_LIMITER.failure(url, "timeout")
+        return None
+    # 과부하(429/5xx)와 봇 차단(403/로그인 리다이렉트) 모두 속도를 낮추고 백오프 (브라우저 경로와 동일)
+    if resp.status_code == 429 or resp.status_code >= 500:
+        RATE_LIMITER.failure(url, f"HTTP {resp.status_code}")
+        return None
+    if "/login/" in resp.url or resp.status_code >= 400:
+        reason = "login" if "/login/" in resp.url else f"HTTP {resp.status_code}"
+        RATE_LIMITER.failure(url, reason)
+        _fast_path_miss(url, reason)
+        return None
+    if resp.status_code != 200:
+        _fast_path_miss(url, f"HTTP {resp.status_code}")
+        return None
+    RATE_LIMITER.success(url)
+
+    try:
+        snap, detail_images = snapshot_from_html(resp.text)
+        item = build_item_from_snapshot(url, snap)
+        item["detail_images"] = detail_images
+    except Exception:
+        _fast_path_miss(url, "parse")
+        return None
+
+    # 상세 영역은 보통 스크립트로 로드되므로 원본 HTML에 상세 이미지가 없으면 브라우저로 수집
+    missing = [f for f in FAST_PATH_REQUIRED if item.get(f) in (None, "", 0, "N/A", [])]
+    # 가격은 배송비 가산 전 JSON-LD 가격으로 판단 (offers.price가 없으면 배송비만 남음)
+    if "price" in FAST_PATH_REQUIRED and "price" not in missing and item["price"] - shipping_fee(snap) <= 0:
+        missing.append("price")
+    if missing:
+        print(f"    ↩️ [FastPath] 필수 필드 누락 {missing} -> 브라우저 경로로 전환")
+        _fast_path_miss(url, f"누락 {missing}")
+        return None
+    with _fast_path_lock:
+        _fast_path_misses = 0
+
+    if archive:
+        try: archive.save(url, resp.text, detail_images=item["detail_images"], source="http")
+        except Exception as e: print(f"    ⚠️ 스냅샷 저장 실패: {e}")
+
+    print(f"   ⚡ [FastPath] 쿠팡 수집 완료 ({time.time() - started:.2f}s): {item['name'][:10]}... | 모델:{item['model']}")
+    return item
+
+# ======================================================
+# [탐색] 검색/카테고리 목록 -> 수집 대기열
+# ======================================================
+# 목록 페이지 1장에서 상품 링크를 한 번의 evaluate로 수집
+_LISTING_JS = """() => {
+    const seen = new Set();
+    for (const a of document.querySelectorAll('a[href*="/vp/products/"]')) seen.add(a.href);
+    return Array.from(seen);
+}"""
+
+def listing_page_url(source, page_no):
+    """키워드는 검색 URL로, 목록 URL(검색/카테고리)은 page 파라미터만 교체합니다."""
+    if "coupang.com" not in source:
+        return SEARCH_URL.format(query=quote(source), page=page_no)
+    if not source.startswith("http"): source = "https://" + source
+    parts = urlsplit(source)
+    params = [(k, v) for k, v in parse_qsl(parts.query) if k != "page"] + [("page", str(page_no))]
+    return urlunsplit(parts._replace(query=urlencode(params)))
+
+def discover_products(page, sources, frontier, max_pages=DISCOVERY_MAX_PAGES):
+    """목록 페이지를 넘기며 상품 URL을 찾아 frontier에 등록하고, 신규 등록 건수를 반환합니다."""
+    total_added = 0
+    for source in sources:
+        for page_no in range(1, max_pages + 1):
+            url = listing_page_url(source, page_no)
+            print(f"🔎 [Discovery] {source} - {page_no}페이지")
+            RATE_LIMITER.acquire(url)
+            try:
+                page.goto(url, wait_until="domcontentloaded", timeout=10000)
+            except Exception as e:
+                RATE_LIMITER.failure(url, "timeout" if "Timeout" in str(e) else "goto-error")
+            if "/login/" in page.url:
+                RATE_LIMITER.failure(url, "login")
+                break
+
+            try:
+                with perf_stats.timed("discovery.evaluate"):
+                    links = page.evaluate(_LISTING_JS)
+            except Exception as e:
+                print(f"    ⚠️ 목록 추출 실패: {e}")
+                break
+            RATE_LIMITER.success(url)
+
+            if not links:
+                print("    ℹ️ 더 이상 상품이 없습니다.")
+                break
+            added = frontier.add(links)
+            total_added += added
+            print(f"    ➕ 상품 {len(links)}개 발견, 신규 {added}개 대기열 등록")
+    return total_added
+
+def run_discovery(sources, frontier, cdp_url=CDP_URL):
+    with sync_playwright() as p:
+        try:
+            browser = p.chromium.connect_over_cdp(cdp_url)
+        except Exception as e:
+            print(f"    ❌ [Discovery] 크롬 연결 실패: {e}")
+            return 0
+        page = browser.contexts[0].new_page()
+        if ROUTE_FILTER_ENABLED: RouteFilter("images").install(page)
+        try:
+            return discover_products(page, sources, frontier)
+        finally:
+            try: page.close()
+            except: pass
+            try: browser.close()
+            except: pass
+
+# ======================================================
+# [모듈 4] 동시 수집 엔진 (멀티 탭 워커 풀)
+# ======================================================
+# 모든 워커가 공유하는 전역 동시성 상한 (여러 엔진이 동시에 돌아도 탭 수 제한)
+_CRAWL_GATE = threading.BoundedSemaphore(CRAWL_CONCURRENCY)
+_WORKER_STOP = object()
+
+class CrawlWorkerPool:
+    """
+    멀티 탭 워커 풀. 워커 스레드 1개 = 탭 1개이며, 스레드/탭은 배치 사이에도 유지됩니다.
+    - run_batch(urls, start_index): URL을 워커에 분배하고 모두 처리될 때까지 대기 (배치 사이에는 워커가 유휴 대기)
+    - reconnect(): 크롬 재시작 후 호출 -> 각 워커가 다음 작업 전에 CDP에 다시 접속하고 새 탭을 엽니다.
+    - 탭은 TAB_RECYCLE_EVERY_N건마다 닫고 새로 엽니다 (배치 경계와 무관하게 누적 처리 건수 기준).
+    - on_result(idx, url, data)는 여러 스레드에서 호출되므로 내부에서 공유 자원 보호가 필요합니다.
+    Playwright sync API는 스레드 간 공유가 불가하므로 워커마다 별도 인스턴스로 CDP에 접속합니다.
+    """
+    def __init__(self, on_result, concurrency=CRAWL_CONCURRENCY, cdp_url=CDP_URL, archive=None, image_cache=None):
+        self.on_result = on_result
+        self.cdp_url = cdp_url
+        self.archive = archive
+        self.image_cache = image_cache
+        self.tasks = queue.Queue()
+        self.generation = 0
+        self.workers = [
+            threading.Thread(target=self._worker, args=(i + 1,), name=f"crawl-worker-{i + 1}", daemon=True)
+            for i in range(max(1, concurrency))
+        ]
+        for w in self.workers: w.start()
+
+    def run_batch(self, urls, start_index=0):
+        print(f"    🧵 [Engine] 탭 {len(self.workers)}개로 {len(urls)}건 동시 수집")
+        for idx, url in enumerate(urls, start_index):
+            self.tasks.put((idx, url))
+        self.tasks.join()
+
+    def reconnect(self):
+        self.generation += 1
+
+    def close(self):
+        for _ in self.workers: self.tasks.put(_WORKER_STOP)
+        for w in self.workers: w.join()
+
+    def _worker(self, worker_id):
+        with sync_playwright() as p:
+            browser = page = None
+            generation = None
+            served = 0
+            route_filter = RouteFilter(allow_images=self.image_cache is not None) if ROUTE_FILTER_ENABLED else None
+            response_capture = ResponseCapture() if CAPTURE_MODE else None
+            image_capture = ImageCapture(self.image_cache) if self.image_cache is not None else None
+
+            def disconnect():
+                for obj in (page, browser):
+                    try:
+                        if obj is not None: obj.close()
+                    except: pass
+
+            try:
+                while True:
+                    task = self.tasks.get()
+                    if task is _WORKER_STOP:
+                        self.tasks.task_done()
+                        break
+                    idx, url = task
+                    data = None
+                    try:
+                        # 크롬이 재시작되었으면 재접속
+                        if browser is None or generation != self.generation:
+                            disconnect()
+                            browser = page = None
+                            generation = self.generation
+                            try:
+                                browser = p.chromium.connect_over_cdp(self.cdp_url)
+                            except Exception as e:
+                                print(f"    ❌ [Worker {worker_id}] 크롬 연결 실패: {e}")
+                                continue
+
+                        # 탭 재활용: 처음 또는 N건마다 새 탭으로 교체
+                        if page is None or (TAB_RECYCLE_EVERY_N and served and served % TAB_RECYCLE_EVERY_N == 0):
+                            if page is not None:
+                                try: page.close()
+                                except: pass
+                                print(f"    ♻️ [Worker {worker_id}] {served}건 처리 -> 새 탭으로 교체")
+                            page = browser.contexts[0].new_page()
+                            if route_filter: route_filter.install(page)
+                            if response_capture: response_capture.install(page)
+                            if image_capture: image_capture.install(page)
+                        served += 1
+
+                        data = crawl_item_http(url, self.archive) if fast_path_enabled() else None
+                        if data is None:
+                            if image_capture: image_capture.begin()
+                            with _CRAWL_GATE:
+                                data = crawl_item(page, url, route_filter, self.archive, response_capture, EXPAND_VARIANTS)
+                            if image_capture and data:
+                                saved = image_capture.flush(data if isinstance(data, list) else [data])
+                                if saved: print(f"    🖼️ [Worker {worker_id}] 이미지 {saved}개 캐시 저장")
+                        if route_filter:
+                            report = route_filter.take_report()
+                            print(f"    🛡️ [Worker {worker_id}] 요청 {report['total']}건 차단 (약 {report['bytes_saved'] // 1024} KB 절감) {report['blocked']}")
+                    except Exception as e:
+                        print(f"    ❌ [Worker {worker_id}] 에러: {e}")
+                        data = None
+                    finally:
+                        try: self.on_result(idx, url, data)
+                        except Exception as e: print(f"    ❌ [Worker {worker_id}] 결과 처리 에러: {e}")
+                        self.tasks.task_done()
+            finally:
+                disconnect()
+
+def crawl_concurrently(urls, on_result, concurrency=CRAWL_CONCURRENCY, cdp_url=CDP_URL, start_index=0, archive=None, image_cache=None):
+    """URL 리스트 1개를 임시 워커 풀로 동시에 수집합니다. (여러 배치를 처리할 때는 CrawlWorkerPool을 유지해서 사용)"""
+    pool = CrawlWorkerPool(on_result, max(1, min(concurrency, len(urls))), cdp_url, archive, image_cache)
+    try:
+        pool.run_batch(urls, start_index)
+    finally:
+        pool.close()
+
 # ======================================================
 # [실행] 메인 루프 (Phase 1 & Phase 2)
 # ======================================================
-def run_crawler():
+def merge_s2b_data(item, s2b_data):
+    """S2B 데이터 우선 적용 (Golden Key)"""
+    if s2b_data["category"]: item["category"] = s2b_data["category"]
+    if s2b_data["manufacturer"]: item["maker"] = s2b_data["manufacturer"]
+    if s2b_data["origin"]: item["origin"] = s2b_data["origin"]
+    if s2b_data["g2b_code"]: item["g2b_code"] = s2b_data["g2b_code"]
+    
+    # KC 정보 병합
+    s2b_kc_strs = [f"{k['category']}:{k['code']}" for k in s2b_data["kc_list"]]
+    if s2b_kc_strs:
+        current_kc = item["kc"].split(" / ") if item["kc"] != "상세설명참조" else []
+        combined = list(set(current_kc + s2b_kc_strs))
+        item["kc"] = " / ".join(combined)
+
+def open_result_store():
+    """결과 저장소를 열고, 최초 실행 시 기존 s2b_results.json을 가져옵니다."""
+    store = ResultStore(RESULT_STORE_FILE, key_fn=lambda record: product_key(record.get("url", "")))
+    if not os.path.exists(RESULT_STORE_FILE) and os.path.exists(OUTPUT_FILE):
+        imported = store.import_json(OUTPUT_FILE)
+        print(f"    📦 [Store] 기존 {OUTPUT_FILE}에서 {imported}건 이전")
+    return store
+
+def open_frontier(store):
+    """수집 대기열을 열고, 대기열이 비어 있으면 저장소의 기존 결과를 완료 상태로 등록합니다."""
+    frontier = CrawlFrontier()
+    if not frontier.stats():
+        for record in store.iter_records():
+            frontier.mark_done(record.get("url", ""), commit=False)
+        frontier.commit()
+    return frontier
+
+def needs_enrichment(item):
+    """모델명이 있고 아직 G2B 코드가 없는 아이템만 S2B 검색 대상"""
+    return bool(item.get("model") and len(item["model"]) > 3 and not item.get("g2b_code"))
+
+def enrich_items(enricher, store, items, label=""):
+    """아이템 목록을 정규화 모델명별로 1회씩 조회하여 병합/기록하고, 보강된 아이템 수를 반환합니다."""
+    targets = {}
+    for item in items:
+        targets.setdefault(normalize_model(item["model"]), []).append(item)
+
+    updated = 0
+    models = [group[0]["model"] for group in targets.values()]
+    for done, (model, s2b_data) in enumerate(enricher.fetch_many(models, concurrency=ENRICH_CONCURRENCY), 1):
+        group = targets.get(normalize_model(model), [])
+        print(f"🔹 {label}[{done}/{len(models)}] S2B 검색: {model} ({len(group)}건)")
+        if s2b_data:
+            print("    🎉 매칭 성공! 데이터 병합 중...")
+            for item in group:
+                merge_s2b_data(item, s2b_data)
+                store.append(item) # 변경된 아이템만 추가 기록
+                updated += 1
+        else:
+            print("    ⚠️ 매칭 실패. 기존 데이터 유지.")
+    return updated
+
+# ======================================================
+# [파이프라인] 수집과 보강 동시 실행 (생산자 -> 제한 큐 -> 소비자)
+# ======================================================
+_PIPELINE_STOP = object()
+
+class EnrichPipeline:
+    """
+    수집 워커(생산자)가 submit()한 아이템을 보강 스레드(소비자)가 바로 S2B에서 조회합니다.
+    - 큐 크기가 제한되어 있어 보강이 밀리면 수집 워커가 대기합니다 (역압).
+    - 소비자는 보강 전용 크롬(chrome, ENRICH_CDP_PORT)을 띄우고 자체 S2B_Enricher 세션을 사용합니다.
+      (Playwright 객체는 스레드 전용이므로 세션은 소비자 스레드 안에서만 생성/사용)
+    - finish()는 남은 큐를 모두 처리한 뒤 반환합니다. 보강 크롬은 Phase 2에서 재사용하므로 호출자가 종료합니다.
+    - 소비자가 비정상 종료되면(dead) submit()은 무시되고, 보강되지 않은 아이템은 Phase 2에서 처리됩니다.
+    """
+    def __init__(self, store, cache, mirror, chrome):
+        self.store = store
+        self.cache = cache
+        self.mirror = mirror
+        self.chrome = chrome
+        self.queue = queue.Queue(maxsize=ENRICH_QUEUE_SIZE)
+        self.updated = 0
+        self.submitted = 0
+        self.dead = False
+        self._thread = threading.Thread(target=self._run, name="enrich-pipeline", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def submit(self, item):
+        if self.dead or not needs_enrichment(item): return
+        self.submitted += 1
+        self._put(item)
+
+    def finish(self):
+        if self._put(_PIPELINE_STOP): self._thread.join()
+        print(f"    🔗 [Pipeline] 보강 요청 {self.submitted}건 중 {self.updated}건 보강")
+
+    def _put(self, x):
+        """큐가 가득 차면 대기 (역압). 대기 중 소비자가 죽으면 포기하고 False"""
+        while not self.dead and self._thread.is_alive():
+            try:
+                self.queue.put(x, timeout=1)
+                return True
+            except queue.Full: continue
+        return False
+
+    def _run(self):
+        enricher = None
+        try:
+            self.chrome.start()
+            enricher = S2B_Enricher(cdp_url=self.chrome.cdp_url, cache=self.cache, mirror=self.mirror)
+            stopping = False
+            while not stopping:
+                batch = [self.queue.get()]
+                while len(batch) < ENRICH_BATCH_SIZE:
+                    try: batch.append(self.queue.get_nowait())
+                    except queue.Empty: break
+                stopping = any(x is _PIPELINE_STOP for x in batch)
+                items = [x for x in batch if x is not _PIPELINE_STOP]
+                if not items: continue
+                try:
+                    with perf_stats.timed("pipeline.batch"):
+                        self.updated += enrich_items(enricher, self.store, items, "[Pipeline] ")
+                except Exception as e:
+                    print(f"    ❌ [Pipeline] 보강 에러: {e}")
+        except Exception as e:
+            print(f"    ❌ [Pipeline] 보강 스레드 중단 (남은 아이템은 Phase 2에서 보강): {e}")
+        finally:
+            self.dead = True
+            if enricher: enricher.close()
+
+def crawl_with_chrome(urls, chrome, store, frontier, archive=None, label="", image_cache=None, pipeline=None):
+    """실행 중인 크롬 1개로 URL 목록을 배치 단위로 수집 (배치 사이에 메모리 측정/재시작/휴식, pipeline이 있으면 보강 큐로 전달)"""
+    total = len(urls)
+
+    def on_result(idx, url, data):
+        print(f"\n{label}[{idx+1}/{total}] 처리 완료")
+        if data:
+            # 옵션 확장 시 data는 리스트 -> 옵션 상품도 완료 처리하여 개별 수집 생략
+            records = data if isinstance(data, list) else [data]
+            for record in records:
+                store.append(record)
+                if pipeline: pipeline.submit(record)
+            for record in records[1:]:
+                frontier.mark_done(record["url"], commit=False)
+            frontier.mark_done(url)
+        else:
+            frontier.mark_failed(url, "crawl_item returned no data")
+
+    # 워커(탭)는 배치 사이에도 유지 -> 크롬이 재시작된 경우에만 재접속
+    batch_size = max(BATCH_SLEEP_EVERY_N or 0, CRAWL_CONCURRENCY)
+    pool = CrawlWorkerPool(on_result, max(1, min(CRAWL_CONCURRENCY, total)), chrome.cdp_url, archive, image_cache)
+    try:
+        for start in range(0, total, batch_size):
+            batch = urls[start:start + batch_size]
+            try:
+                pool.run_batch(batch, start)
+            except Exception as e:
+                print(f"❌ {label}Phase 1 에러: {e}")
+            store.sync()
+            if start + batch_size < total:
+                restarts = chrome.restarts
+                chrome.after_batch(len(batch))
+                if chrome.restarts != restarts: pool.reconnect()
+    finally:
+        pool.close()
+
+    stats = chrome.stats()
+    print(f"    📊 {label}[Lifecycle] 재시작 {stats['restarts']}회 {stats['restart_reasons']} | 최대 RSS {stats['rss_mb_max']}MB")
+
+# ======================================================
+# [샤딩] 멀티 프로세스 x 멀티 크롬
+# ======================================================
+def shard_of(url, n_shards):
+    """상품 키 기반 고정 샤드 번호 (실행마다 같은 상품은 같은 샤드로)"""
+    return zlib.crc32(product_key(url).encode("utf-8")) % n_shards
+
+def _shard_main(shard_idx, urls, n_active=1):
+    """자식 프로세스: 전용 포트/프로필의 크롬 + 전용 결과 파일로 수집"""
+    label = f"[Shard {shard_idx}] "
+    # 속도 제한기는 프로세스마다 따로 있으므로 호스트별 속도를 실행 중인 샤드 수로 나눠 합계를 정책 속도로 유지
+    RATE_LIMITER.set_share(1 / max(1, n_active))
+    chrome = ChromeManager(
+        SHARD_BASE_PORT + shard_idx, f"{CHROME_USER_DIR}_shard{shard_idx}",
+        restart_every=RESTART_EVERY_N, max_rss_mb=MAX_CHROME_RSS_MB,
+        batch_sleep_every=BATCH_SLEEP_EVERY_N, batch_sleep=BATCH_SLEEP_DURATION,
+    )
+    store = ResultStore(SHARD_STORE_PATTERN.format(idx=shard_idx),
+                        key_fn=lambda record: product_key(record.get("url", "")))
+    frontier = CrawlFrontier()
+    archive = SnapshotArchive(index_name=SHARD_ARCHIVE_INDEX_PATTERN.format(idx=shard_idx)) if ARCHIVE_SNAPSHOTS else None
+    image_cache = BlobCache(index_name=SHARD_BLOB_INDEX_PATTERN.format(idx=shard_idx)) if CACHE_IMAGES else None
+
+    if not chrome.start():
+        print(f"❌ {label}크롬 실행 실패")
+        return
+    try:
+        crawl_with_chrome(urls, chrome, store, frontier, archive, label, image_cache)
+    finally:
+        store.close()
+        frontier.close()
+        if archive: archive.close()
+        if image_cache: image_cache.close()
+        chrome.stop()
+
+def merge_shard_outputs(store):
+    """샤드 결과 파일(결과/스냅샷 인덱스/이미지 캐시 인덱스)을 메인 저장소로 병합 (부모 프로세스만 메인 파일에 기록). 이전 실행의 잔여 샤드도 함께 병합."""
+    merged = 0
+    for path in sorted(glob.glob(SHARD_STORE_PATTERN.format(idx="*"))):
+        merged += store.merge_from(path)
+    if os.path.isdir(ARCHIVE_DIR):
+        archive = SnapshotArchive()
+        for path in sorted(glob.glob(os.path.join(ARCHIVE_DIR, SHARD_ARCHIVE_INDEX_PATTERN.format(idx="*")))):
+            archive.index.merge_from(path)
+        archive.close()
+    if os.path.isdir(BLOB_CACHE_DIR):
+        image_cache = BlobCache()
+        for path in sorted(glob.glob(os.path.join(BLOB_CACHE_DIR, SHARD_BLOB_INDEX_PATTERN.format(idx="*")))):
+            image_cache.index.merge_from(path)
+        image_cache.close()
+    return merged
+
+def run_sharded(urls, n_shards, store):
+    shards = [[] for _ in range(n_shards)]
+    for url in urls:
+        shards[shard_of(url, n_shards)].append(url)
+
+    print(f"    🧩 [Shard] {n_shards}개 프로세스로 분할: {[len(x) for x in shards]}")
+    n_active = sum(1 for x in shards if x)
+    procs = []
+    for idx, shard_urls in enumerate(shards):
+        if not shard_urls: continue
+        proc = multiprocessing.Process(target=_shard_main, args=(idx, shard_urls, n_active), name=f"shard-{idx}")
+        proc.start()
+        procs.append(proc)
+    for proc in procs:
+        proc.join()
+        if proc.exitcode: print(f"    ⚠️ [Shard] {proc.name} 비정상 종료 (exit {proc.exitcode})")
+
+    merged = merge_shard_outputs(store)
+    print(f"    🧩 [Shard] 결과 {merged}건 병합 완료")
+
+def run_crawler(discover=None, shards=None):
     # --------------------------------------------------
     # [PHASE 1] 쿠팡 상품 정보 수집 (Playwright Context 1)
     # --------------------------------------------------
     print("\n🚀 [PHASE 1] 쿠팡 상품 정보 수집 시작...")
     
-    urls_to_crawl = TARGET_URLS
-    results = []
+    store = open_result_store()
+    merge_shard_outputs(store)
+    store.compact()
 
-    # 기존 데이터 로드
-    if os.path.exists(OUTPUT_FILE):
-        try:
-            with open(OUTPUT_FILE, 'r', encoding='utf-8') as f:
-                saved_data = json.load(f)
-                crawled_urls = set(item['url'] for item in saved_data)
-                urls_to_crawl = [u for u in TARGET_URLS if u not in crawled_urls]
-                results = saved_data
-        except: pass
+    # 상품 키 기준 중복 제거 (추적 파라미터가 달라도 같은 상품은 1회만 수집)
+    frontier = open_frontier(store)
+    added = frontier.add(TARGET_URLS)
+
+    chrome = ChromeManager(
+        CDP_PORT, CHROME_USER_DIR,
+        restart_every=RESTART_EVERY_N, max_rss_mb=MAX_CHROME_RSS_MB,
+        batch_sleep_every=BATCH_SLEEP_EVERY_N, batch_sleep=BATCH_SLEEP_DURATION,
+    )
+    chrome_started = False
+
+    # 검색/카테고리 목록에서 상품 자동 탐색
+    sources = list(SEARCH_KEYWORDS) + list(discover or [])
+    if sources:
+        chrome_started = chrome.start()
+        added += run_discovery(sources, frontier, chrome.cdp_url)
+
+    urls_to_crawl = frontier.pending()
+    print(f"    🗂️ [Frontier] 신규 {added}건 등록 | 수집 대상 {len(urls_to_crawl)}건 | 상태 {frontier.stats()}")
+
+    # S2B 보강 결과는 캐시 -> 로컬 미러 -> 실시간 순으로 조회 (파이프라인과 Phase 2가 공유)
+    # 보강 전용 크롬은 수집 크롬과 프로필/포트가 달라 수집 크롬 재시작/종료의 영향을 받지 않음
+    enrich_cache = EnrichCache()
+    mirror = S2BMirror()
+    enrich_chrome = ChromeManager(ENRICH_CDP_PORT, f"{CHROME_USER_DIR}_s2b")
+    pipeline = None
 
     if urls_to_crawl:
-        kill_chrome()
-        launch_chrome()
-        
-        with sync_playwright() as p:
-            try:
-                browser = p.chromium.connect_over_cdp(CDP_URL)
-                context = browser.contexts[0]
-                page = context.new_page()
-                
-                for i, url in enumerate(urls_to_crawl):
-                    print(f"\n[{i+1}/{len(urls_to_crawl)}] 처리 중...")
-                    data = crawl_item(page, url) 
-                    
-                    if data:
-                        results.append(data)
-                        with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-                            json.dump(results, f, ensure_ascii=False, indent=4)
-                    
-                    time.sleep(random.uniform(2, 4))
-            except Exception as e:
-                print(f"❌ Phase 1 에러: {e}")
-            finally:
-                try: context.close()
-                except: pass
-                try: browser.close()
-                except: pass
-        
-        kill_chrome() # 브라우저 완전 종료 (리소스 해제)
+        n_shards = shards or SHARD_COUNT
+        if n_shards > 1:
+            if chrome_started: chrome.stop()
+            run_sharded(urls_to_crawl, n_shards, store)
+        else:
+            if not chrome_started: chrome.start()
+            archive = SnapshotArchive() if ARCHIVE_SNAPSHOTS else None
+            image_cache = BlobCache() if CACHE_IMAGES else None
+            # 수집과 동시에 보강 (보강 전용 크롬 + 제한 큐)
+            if ENRICH_PIPELINE:
+                pipeline = EnrichPipeline(store, enrich_cache, mirror, enrich_chrome)
+                pipeline.start()
+            crawl_with_chrome(urls_to_crawl, chrome, store, frontier, archive, image_cache=image_cache, pipeline=pipeline)
+            if pipeline: pipeline.finish()   # 남은 보강 큐 처리 (보강 크롬 사용, 수집 크롬과 무관)
+            chrome.stop() # 브라우저 완전 종료 (리소스 해제)
+            if archive: archive.close()
+            if image_cache: image_cache.close()
         print("✅ [PHASE 1] 쿠팡 수집 완료. 브라우저 종료됨.\n")
     else:
+        if chrome_started: chrome.stop()
         print("🎉 신규 수집할 URL이 없습니다. Phase 2로 넘어갑니다.\n")
 
     # --------------------------------------------------
@@ -297,53 +1432,91 @@ def run_crawler():
     # --------------------------------------------------
     print("🚀 [PHASE 2] S2B 데이터 보강(Enrichment) 시작...")
     
-    # S2B Enricher 초기화 (새로운 브라우저 세션 시작)
-    enricher = S2B_Enricher() 
-    
-    # 최신 데이터 다시 로드
-    if os.path.exists(OUTPUT_FILE):
-        with open(OUTPUT_FILE, 'r', encoding='utf-8') as f:
-            current_data = json.load(f)
-    else:
-        print("❌ 처리할 데이터 파일이 없습니다.")
+    # 파이프라인이 처리하지 못한 나머지(이전 실행분, 샤딩 결과, 파이프라인 미사용 실행)만 남아 있음
+    updated_count = pipeline.updated if pipeline else 0
+
+    total = len(store)
+    if not total:
+        print("❌ 처리할 데이터가 없습니다.")
+        enrich_chrome.stop()
+        enrich_cache.close()
+        mirror.close()
         return
 
-    updated_count = 0
-    for idx, item in enumerate(current_data):
-        # 모델명이 있고 아직 G2B 코드가 없는 경우에만 S2B 검색 시도
-        if item.get("model") and len(item["model"]) > 3 and not item.get("g2b_code"):
-            
-            print(f"🔹 [{idx+1}/{len(current_data)}] S2B 검색: {item['model']}")
-            s2b_data = enricher.fetch_s2b_details(item["model"])
-            
-            if s2b_data:
-                print("    🎉 매칭 성공! 데이터 병합 중...")
-                # S2B 데이터 우선 적용 (Golden Key)
-                if s2b_data["category"]: item["category"] = s2b_data["category"]
-                if s2b_data["manufacturer"]: item["maker"] = s2b_data["manufacturer"]
-                if s2b_data["origin"]: item["origin"] = s2b_data["origin"]
-                if s2b_data["g2b_code"]: item["g2b_code"] = s2b_data["g2b_code"]
-                
-                # KC 정보 병합
-                s2b_kc_strs = [f"{k['category']}:{k['code']}" for k in s2b_data["kc_list"]]
-                if s2b_kc_strs:
-                    current_kc = item["kc"].split(" / ") if item["kc"] != "상세설명참조" else []
-                    combined = list(set(current_kc + s2b_kc_strs))
-                    item["kc"] = " / ".join(combined)
-                
-                updated_count += 1
-            else:
-                print("    ⚠️ 매칭 실패. 기존 데이터 유지.")
-            
-            # 중간 저장 (데이터 보호)
-            with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-                json.dump(current_data, f, ensure_ascii=False, indent=4)
-            
-            time.sleep(1) # S2B 서버 부하 방지
-        else:
-            print(f"    Pass: 모델명 없음 or 이미 완료됨 ({item.get('name')[:10]}...)")
+    # 보강 대상 수집 (같은 정규화 모델명의 아이템은 1회 조회 결과를 공유, 끝나는 순서대로 기록)
+    targets = []
+    for item in store.iter_records():
+        if needs_enrichment(item): targets.append(item)
+        else: print(f"    Pass: 모델명 없음 or 이미 완료됨 ({item.get('name')[:10]}...)")
+
+    if targets:
+        # 보강 전용 크롬: 파이프라인이 이미 띄웠으면 재사용, 아니면(샤딩/파이프라인 미사용) 여기서 실행
+        if pipeline is None and not enrich_chrome.start():
+            print("    ⚠️ 보강용 크롬 실행 실패 -> 캐시/미러/직접 요청으로만 보강")
+        # S2B Enricher 초기화 (세션은 첫 브라우저 조회 시 1회 연결 후 재사용)
+        enricher = S2B_Enricher(cdp_url=enrich_chrome.cdp_url, cache=enrich_cache, mirror=mirror)
+        updated_count += enrich_items(enricher, store, targets)
+        enricher.close()
 
-    print(f"\n🎉 전체 작업 종료! 총 {len(current_data)}개 중 {updated_count}개 보강됨.")
+    enrich_chrome.stop()
+    print(f"    💾 [EnrichCache] {enrich_cache.stats()}")
+    enrich_cache.close()
+    mirror.close()
+    store.close()
+    store.compact()
+    store.export_json(OUTPUT_FILE)
+    perf_stats.report()
+    print(f"    🚦 [RateLimit] {RATE_LIMITER.stats()}")
+    print(f"\n🎉 전체 작업 종료! 총 {total}개 중 {updated_count}개 보강됨.")
+
+# ======================================================
+# [오프라인] 스냅샷 재추출 (--reparse)
+# ======================================================
+# S2B 보강으로 덮어쓴 필드 (재추출 시 기존 값 유지)
+S2B_OWNED_FIELDS = ("g2b_code", "category", "maker", "origin", "kc")
+
+def reparse_from_archive():
+    """
+    브라우저 없이 스냅샷 보관소만으로 결과 저장소를 재구성합니다.
+    추출 로직(_SPECS_JS_BODY/RawPageParser 스펙 규칙, extract_kc_by_regex, get_best_value) 수정 후 재수집 없이 결과를 확인할 때 사용합니다.
+    이미 S2B 보강이 끝난 아이템(g2b_code 보유)은 S2B_OWNED_FIELDS 값을 유지합니다.
+    """
+    print("\n🗃️ [REPARSE] 스냅샷 보관소에서 재추출 시작...")
+    archive = SnapshotArchive()
+    store = open_result_store()
+    previous = {product_key(r.get("url", "")): r for r in store.iter_records()}
+
+    started = time.time()
+    count = 0
+    for snap in archive.iter_snapshots():
+        with perf_stats.timed("reparse.item"):
+            # DOM 원본이 있으면 DOM에서 재추출, 없으면(이전 형식) 캡처 결과 사용
+            if snap.get("html"): item = build_item_from_html(snap["url"], snap["html"], snap.get("api"))
+            else: item = build_item_from_snapshot(snap["url"], snap["capture"], snap.get("api"))
+            if snap.get("detail_images"): item["detail_images"] = snap["detail_images"]
+
+        prev = previous.get(product_key(snap["url"]))
+        if prev and prev.get("g2b_code"):
+            for field in S2B_OWNED_FIELDS: item[field] = prev.get(field, item[field])
+        store.append(item)
+        count += 1
+
+    store.close()
+    store.compact(force=True)
+    store.export_json(OUTPUT_FILE)
+    perf_stats.report("재추출 통계")
+    print(f"✅ [REPARSE] {count}건 재추출 완료 ({time.time() - started:.2f}s)")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="쿠팡 상품 수집 + S2B 데이터 보강")
+    parser.add_argument("--reparse", action="store_true", help="브라우저 없이 스냅샷 보관소에서 s2b_results를 재구성")
+    parser.add_argument("--shards", type=int, metavar="N", help="크롬 N개 / 프로세스 N개로 나누어 수집 (기본: SHARD_COUNT)")
+    parser.add_argument("--discover", nargs="+", metavar="KEYWORD_OR_URL", help="검색 키워드 또는 쿠팡 목록 URL에서 상품을 찾아 대기열에 추가")
+    return parser.parse_args(argv)
 
 if __name__ == "__main__":
-    run_crawler()
\ No newline at end of file
+    args = parse_args(sys.argv[1:])
+    if args.reparse:
+        reparse_from_archive()
+    else:
+        run_crawler(discover=args.discover, shards=args.shards)
\ No newline at end of file
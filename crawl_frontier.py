@@ -0,0 +1,140 @@
+import re
+import time
+import sqlite3
+import threading
+from urllib.parse import urlsplit, parse_qs, urlencode
+
+# ======================================================
+# [설정] 수집 대기열 정책
+# ======================================================
+FRONTIER_DB = 'crawl_frontier.db'
+MAX_ATTEMPTS = 3            # 실패 아이템 재시도 한도
+RECRAWL_AFTER_DAYS = None   # 완료 아이템 재수집 주기 (None = 재수집 안 함)
+
+# ======================================================
+# [모듈 1] URL 정규화 (상품 키)
+# ======================================================
+_PRODUCT_PATH = re.compile(r"/vp/products/(\d+)")
+
+def normalize_coupang_url(url):
+    """
+    추적 파라미터(searchId, traceId, rank 등)를 제거하고 스킴을 보정한 표준 URL을 반환합니다.
+    상품 URL이 아니면 스킴만 보정하여 반환합니다.
+    """
+    url = (url or "").strip()
+    if not re.match(r"^https?://", url):
+        url = "https://" + url.lstrip("/")
+    parts = urlsplit(url)
+    match = _PRODUCT_PATH.search(parts.path)
+    if not match: return url
+
+    qs = parse_qs(parts.query)
+    keep = {k: qs[k][0] for k in ("itemId", "vendorItemId") if qs.get(k)}
+    canonical = f"https://www.coupang.com/vp/products/{match.group(1)}"
+    return f"{canonical}?{urlencode(keep)}" if keep else canonical
+
+def product_key(url):
+    """productId/itemId/vendorItemId 기반 상품 키 (예: '8610798143/19665760789/86771432026')"""
+    canonical = normalize_coupang_url(url)
+    parts = urlsplit(canonical)
+    match = _PRODUCT_PATH.search(parts.path)
+    if not match: return canonical
+
+    qs = parse_qs(parts.query)
+    item_id = qs.get("itemId", [""])[0]
+    vendor_item_id = qs.get("vendorItemId", [""])[0]
+    return "/".join(x for x in (match.group(1), item_id, vendor_item_id) if x)
+
+# ======================================================
+# [모듈 2] 영속 수집 대기열 (Crawl Frontier)
+# ======================================================
+class CrawlFrontier:
+    """
+    상품 키 단위 수집 상태 관리 (SQLite)
+    - 상태: pending / done / failed + 시도 횟수, 마지막 수집 시각, 마지막 에러
+    - 조회: 시작 시 키->상태를 메모리에 올려 중복 판별을 O(1)로 처리
+    - 여러 워커 스레드에서 동시에 호출해도 안전합니다.
+    """
+
+    def __init__(self, path=FRONTIER_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS frontier (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_crawled REAL,
+                error TEXT
+            )
+        """)
+        self._conn.commit()
+        self._status = {k: s for k, s in self._conn.execute("SELECT key, status FROM frontier")}
+
+    def __contains__(self, key):
+        return key in self._status
+
+    def status(self, key):
+        return self._status.get(key)
+
+    def add(self, urls):
+        """신규 상품만 pending으로 등록하고 등록 건수를 반환합니다."""
+        added = 0
+        with self._lock:
+            for url in urls:
+                key = product_key(url)
+                if key in self._status: continue
+                self._conn.execute("INSERT OR IGNORE INTO frontier (key, url) VALUES (?, ?)",
+                                   (key, normalize_coupang_url(url)))
+                self._status[key] = "pending"
+                added += 1
+            self._conn.commit()
+        return added
+
+    def mark_done(self, url, commit=True):
+        self._mark(url, "done", None, commit)
+
+    def mark_failed(self, url, error="", commit=True):
+        self._mark(url, "failed", error, commit)
+
+    def _mark(self, url, status, error, commit):
+        key = product_key(url)
+        with self._lock:
+            self._conn.execute("""
+                INSERT INTO frontier (key, url, status, attempts, last_crawled, error)
+                VALUES (?, ?, ?, 1, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    status = excluded.status,
+                    attempts = frontier.attempts + 1,
+                    last_crawled = excluded.last_crawled,
+                    error = excluded.error
+            """, (key, normalize_coupang_url(url), status, time.time(), error))
+            if commit: self._conn.commit()
+            self._status[key] = status
+
+    def commit(self):
+        with self._lock:
+            self._conn.commit()
+
+    def pending(self, max_attempts=MAX_ATTEMPTS, recrawl_after_days=RECRAWL_AFTER_DAYS):
+        """수집 대상 URL 목록: pending + 재시도 한도 미만 failed (+ 재수집 주기가 지난 done)"""
+        sql = "SELECT url FROM frontier WHERE status = 'pending' OR (status = 'failed' AND attempts < ?)"
+        args = [max_attempts]
+        if recrawl_after_days is not None:
+            sql += " OR (status = 'done' AND last_crawled < ?)"
+            args.append(time.time() - recrawl_after_days * 86400)
+        with self._lock:
+            return [row[0] for row in self._conn.execute(sql + " ORDER BY rowid", args)]
+
+    def stats(self):
+        counts = {}
+        for s in self._status.values():
+            counts[s] = counts.get(s, 0) + 1
+        return counts
+
+    def close(self):
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
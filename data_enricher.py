@@ -1,22 +1,296 @@
-import time
 import re
 import warnings
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import perf_stats
 from playwright.sync_api import sync_playwright
+from rate_limiter import RATE_LIMITER
+from enrich_cache import normalize_model
+from s2b_http import S2BHttpClient
 
 # 경고 메시지 숨김
 warnings.filterwarnings("ignore")
 
+# 모든 S2B 페이지에 주입할 팝업 무력화 스크립트 (컨텍스트에 1회 등록)
+POPUP_GUARD_JS = """
+    window.open = function(url) { window.location.href = url; return window; };
+    document.addEventListener('submit', (e) => { 
+        if(e.target.target === '_blank') e.target.target = '_self'; 
+    }, true);
+"""
+SEARCH_INPUT_SELECTORS = ["input#unifiedSearchQuery", "input[name='query']", "input[type='text']"]
+SESSION_POOL_SIZE = 1
+ENRICH_CONCURRENCY = 4    # fetch_many 기본 동시 직접 요청 수 (호스트 속도는 RATE_LIMITER가 별도 제한)
+S2B_HTTP_MODE = True      # 학습된 요청 템플릿 + 로그인 쿠키로 검색/상세를 직접 요청 (실패 시 브라우저 폴백)
+
+MATCH_THRESHOLD = 0.6     # 검색 결과 후보 점수가 이보다 낮으면 상세페이지를 열지 않고 '결과 없음' 처리
+
+# ======================================================
+# [매칭] 검색 결과 후보 점수화 (브라우저/HTTP 경로 공용)
+# ======================================================
+_TOKEN_SPLIT = re.compile(r"[\s,/()\[\]]+")
+
+# 검색 결과 행 1회 evaluate: [goViewPage 코드, 링크 텍스트, 행 텍스트]
+_SEARCH_ROWS_JS = """() => {
+    const out = [];
+    for (const tr of document.querySelectorAll('tbody tr')) {
+        const links = Array.from(tr.querySelectorAll('a')).filter(a => (a.getAttribute('href') || '').includes('goViewPage'));
+        const link = links.find(a => a.innerText.trim().length > 5);
+        if (link) out.push([link.getAttribute('href').replace('javascript:', ''), link.innerText.trim(), tr.innerText]);
+    }
+    return out;
+}"""
+
+def score_candidate(model_name, text, link_text=""):
+    """
+    모델명과 검색 결과 텍스트의 일치 점수 (0~1)
+    - 1.0: 토큰 정확 일치 / 0.9: 하이픈·기호 무시 일치 / ~0.8: 접두 일치 (길이 비율 가중)
+    - 0.7: 링크 텍스트(상품명)에서 공백으로 나뉜 인접 토큰 2~3개를 이어 붙이면 정확히 일치 (예: 'SFN 123')
+      (행 전체 텍스트는 가격/수량 등 무관한 토큰이 이웃하므로 이 규칙에 사용하지 않음)
+    """
+    model = (model_name or "").strip().upper()
+    norm = normalize_model(model)
+    if not norm: return 0.0
+    tokens = [t for t in _TOKEN_SPLIT.split((text or "").upper()) if t]
+    if model in tokens: return 1.0
+    norm_tokens = [normalize_model(t) for t in tokens]
+    if norm in norm_tokens: return 0.9
+
+    best = 0.0
+    for t in norm_tokens:
+        if len(t) >= 4 and (t.startswith(norm) or norm.startswith(t)):
+            best = max(best, 0.8 * min(len(t), len(norm)) / max(len(t), len(norm)))
+    if len(norm) >= 4:
+        words = [normalize_model(w) for w in (link_text or "").upper().split()]
+        for size in (2, 3):
+            if any("".join(words[i:i + size]) == norm for i in range(len(words) - size + 1)):
+                best = max(best, 0.7)
+                break
+    return best
+
+def pick_best_candidate(model_name, candidates):
+    """[(goViewPage 코드, 링크 텍스트, 행 텍스트)] 중 최고 점수 후보와 점수 (동점이면 상위 행)"""
+    best, best_score = None, 0.0
+    for candidate in candidates:
+        score = score_candidate(model_name, f"{candidate[1]} {candidate[2]}", candidate[1])
+        if score > best_score: best, best_score = candidate, score
+    return best, best_score
+
+# ======================================================
+# [파싱] 상세페이지 텍스트 -> 보강 결과 (브라우저/HTTP 경로 공용)
+# ======================================================
+_MAKER_ROW_PATTERN = re.compile(r"제조사.*원산지")
+
+def pick_category(candidates):
+    """'대분류 > 중분류 > ...' 형태의 첫 후보 (HOME 경로/견적 문구 제외)"""
+    for txt in candidates:
+        txt = (txt or "").strip()
+        if " > " in txt and "HOME" not in txt and "견적" not in txt and 10 < len(txt) < 100:
+            return txt
+    return ""
+
+def parse_maker_origin(target_text):
+    """'제조사 / 원산지 : A / (B /) C' 행 텍스트 -> (제조사, 원산지)"""
+    if not target_text: return "", ""
+    if ":" in target_text: val_part = target_text.split(":", 1)[1].strip()
+    else: val_part = target_text.replace("제조사", "").replace("원산지", "").replace("/", "", 1).strip()
+
+    parts = [p.strip() for p in val_part.split("/") if p.strip()]
+    if not parts: return "", ""
+    manufacturer = f"{parts[0]} ({parts[1]})" if len(parts) >= 3 else parts[0]
+    return manufacturer, parts[-1]
+
+def pick_maker_row(rows):
+    """제조사/원산지가 함께 있는 행 중 가장 짧은 행 (200자 미만)"""
+    matched = [r.strip() for r in rows if _MAKER_ROW_PATTERN.search(r or "") and len(r.strip()) < 200]
+    return min(matched, key=len) if matched else ""
+
+def parse_kc_rows(rows):
+    """인증 관련 행 텍스트 -> [{"category", "code"}]"""
+    found_kc = []
+    for row_txt in rows:
+        row_txt = (row_txt or "").strip()
+        if "인증" in row_txt or "적합성" in row_txt:
+            cat = None
+            if "어린이" in row_txt: cat = "어린이제품"
+            elif "전기" in row_txt: cat = "전기용품"
+            elif "생활" in row_txt: cat = "생활용품"
+            elif "방송" in row_txt or "통신" in row_txt: cat = "방송통신"
+
+            if cat and "비대상" not in row_txt and "없음" not in row_txt:
+                match = re.search(r"\[([A-Za-z0-9\-]+)\]", row_txt)
+                if match:
+                    item = {"category": cat, "code": match.group(1).strip()}
+                    if item not in found_kc: found_kc.append(item)
+    return found_kc
+
+def parse_g2b_code(full_text):
+    g2b_match = re.search(r"(\d{8})-(\d{8})", full_text or "")
+    return g2b_match.group(2) if g2b_match else ""
+
+# 상세페이지 1회 evaluate: 본문 텍스트 + 카테고리 후보 + 제조사/인증 관련 행 텍스트
+# 카테고리 후보는 pick_category()와 같은 조건(' > ' 포함, HOME/견적 제외, 10~100자)을 통과한 보이는 요소만 반환
+# (개수 제한 없음 -> 래퍼/HOME 경로가 실제 분류 경로보다 앞에 있어도 누락되지 않음)
+_DETAIL_JS = """() => {
+    const visible = (el) => el.checkVisibility ? el.checkVisibility() : el.getClientRects().length > 0;
+    const categories = [];
+    for (const el of document.querySelectorAll('div, span, p, td')) {
+        const raw = el.textContent;
+        if (raw.length > 300 || !raw.includes('>')) continue;
+        if (!visible(el)) continue;
+        const txt = el.innerText.trim();
+        if (!txt.includes(' > ') || txt.includes('HOME') || txt.includes('견적')) continue;
+        if (txt.length <= 10 || txt.length >= 100) continue;
+        categories.push(txt);
+    }
+    const rows = [];
+    for (const tr of document.querySelectorAll('tr')) {
+        const raw = tr.textContent;
+        if (/인증|적합성|제조사/.test(raw)) rows.push(tr.innerText);
+    }
+    return {text: document.body.innerText, categories, rows};
+}"""
+
+def parse_s2b_detail(full_text, category_candidates, rows, maker_row=None):
+    """상세페이지에서 모은 텍스트/후보/행으로 보강 결과 dict를 만듭니다."""
+    rows = list(rows)
+    manufacturer, origin = parse_maker_origin(maker_row if maker_row is not None else pick_maker_row(rows))
+    return {
+        "g2b_code": parse_g2b_code(full_text),
+        "category": pick_category(category_candidates),
+        "manufacturer": manufacturer,
+        "origin": origin,
+        "kc_list": parse_kc_rows(rows),
+    }
+
 class S2B_Enricher:
     """
     S2B 사이트 전용 정보 보강 클래스 (Golden Key Extractor)
     - 역할: 모델명을 받아 G2B식별번호, 카테고리, 제조사, 원산지, KC인증정보를 추출
     - 특징: 하이브리드 전략 (S2B 데이터 우선 + 정밀 파싱)
+    - 캐시: cache(EnrichCache)가 있으면 먼저 조회하고, 정상 완료된 조회 결과(결과 없음 포함)만 기록합니다.
+    - 미러: mirror(S2BMirror)가 있으면 캐시 다음으로 조회하고, 실시간 조회 성공 결과를 기록합니다 (캐시 -> 미러 -> 실시간).
+    - 직접 요청: http_mode면 학습된 검색/상세 요청을 로그인 쿠키로 바로 보내고 HTML을 파싱합니다.
+      템플릿이 없거나 로그인 만료/형식 불일치면 브라우저 경로로 폴백하며, 브라우저 경로가 템플릿을 학습합니다.
+    - 세션: Playwright/CDP 연결과 검색 페이지에 대기 중인 탭 풀을 유지하여 모델마다 재접속하지 않습니다.
+      (Playwright sync 객체는 생성한 스레드에서만 사용 가능 -> 한 스레드에서 사용하고 끝나면 close())
     """
     
-    def __init__(self, cdp_url="http://127.0.0.1:9222"):
+    def __init__(self, cdp_url="http://127.0.0.1:9222", pool_size=SESSION_POOL_SIZE, cache=None, http_mode=S2B_HTTP_MODE,
+                 mirror=None):
         self.cdp_url = cdp_url
+        self.http = S2BHttpClient(pool_size=ENRICH_CONCURRENCY) if http_mode else None
+        self.cache = cache       # EnrichCache (모델명 -> 결과/결과 없음), None이면 항상 실시간 조회
+        self.mirror = mirror     # S2BMirror (로컬 카탈로그), None이면 사용 안 함
         self.s2b_home = "https://www.s2b.kr/S2BNCustomer/S2B/"
+        self.pool_size = max(1, pool_size)
+        self._pw = None
+        self._browser = None
+        self._context = None
+        self._idle = []          # 검색 페이지에 대기 중인 탭
+
+    # ---------------- 세션 관리 ----------------
+    def start(self):
+        """CDP 연결 + 팝업 무력화 스크립트 등록 + 탭 풀 예열. 성공 여부를 반환합니다."""
+        if self._browser is not None and self._browser.is_connected(): return True
+        self.close()
+
+        with perf_stats.timed("s2b.connect"):
+            try:
+                self._pw = sync_playwright().start()
+                self._browser = self._pw.chromium.connect_over_cdp(self.cdp_url)
+            except Exception as e:
+                print(f"    ❌ 크롬 연결 실패: {e}")
+                self.close()
+                return False
+            self._context = self._browser.contexts[0]
+            self._context.add_init_script(POPUP_GUARD_JS)
+            # 별도 프로필의 크롬(파이프라인 전용 등)에서도 로그인 상태를 쓰도록 저장된 쿠키 주입
+            if self.http is not None and self.http.cookies:
+                try: self._context.add_cookies(self.http.cookies)
+                except Exception as e: print(f"    ⚠️ [S2B Enricher] 쿠키 주입 실패: {e}")
+        self._sync_cookies()
+
+        for _ in range(self.pool_size):
+            page = self._new_page()
+            if page: self._idle.append(page)
+        print(f"    🔌 [S2B Enricher] 세션 준비 완료 (대기 탭 {len(self._idle)}개)")
+        return bool(self._idle)
+
+    def close(self):
+        """세션 종료 (캐시는 호출자가 닫습니다)"""
+        for page in self._idle:
+            try: page.close()
+            except: pass
+        self._idle = []
+        if self._browser is not None:
+            try: self._browser.close()   # CDP 연결만 해제 (크롬 프로세스는 유지)
+            except: pass
+        if self._pw is not None:
+            try: self._pw.stop()
+            except: pass
+        self._pw = self._browser = self._context = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _new_page(self):
+        page = self._context.new_page()
+        if self._park(page): return page
+        try: page.close()
+        except: pass
+        return None
+
+    def _search_input(self, page):
+        for sel in SEARCH_INPUT_SELECTORS:
+            if page.locator(sel).count() > 0 and page.locator(sel).first.is_visible():
+                return page.locator(sel).first
+        return None
+
+    def _park(self, page):
+        """탭을 검색 입력창이 있는 페이지에 대기시킵니다 (이미 있으면 이동 없음)."""
+        try:
+            if self._search_input(page): return True
+        except: pass
+
+        with perf_stats.timed("s2b.warm"):
+            RATE_LIMITER.acquire(self.s2b_home)
+            try:
+                response = page.goto(self.s2b_home, wait_until="domcontentloaded")
+            except Exception as e:
+                RATE_LIMITER.failure(self.s2b_home, "timeout" if "Timeout" in str(e) else "error")
+                return False
+            if "Login" in page.url or (response is not None and response.status >= 400):
+                RATE_LIMITER.failure(self.s2b_home, "login" if "Login" in page.url else f"HTTP {response.status}")
+                return False
+            RATE_LIMITER.success(self.s2b_home)
+            try: page.wait_for_selector(", ".join(SEARCH_INPUT_SELECTORS), timeout=3000)
+            except: pass
+        return True
+
+    def _sync_cookies(self):
+        """브라우저의 최신 로그인 쿠키를 직접 요청 세션(및 s2b_cookies.json)에 반영"""
+        if self.http is None or self._context is None: return
+        try: self.http.save_cookies(self._context.cookies())
+        except Exception as e: print(f"    ⚠️ [S2B HTTP] 쿠키 동기화 실패: {e}")
+
+    def _checkout(self):
+        if not self.start(): return None
+        if self._idle: return self._idle.pop()
+        return self._new_page()
+
+    def _checkin(self, page, ok):
+        """정상 종료된 탭은 검색 페이지로 되돌려 풀에 반납, 오류가 난 탭은 폐기"""
+        if ok and len(self._idle) < self.pool_size and self._park(page):
+            self._idle.append(page)
+            return
+        try: page.close()
+        except: pass
 
+    # ---------------- 조회 ----------------
     def fetch_s2b_details(self, model_name):
         """
         [핵심 함수] 실제 모델명을 인자(Argument)로 받아서 크롤링을 수행합니다.
@@ -25,148 +299,179 @@ class S2B_Enricher:
             print("    ⚠️ 모델명이 비어있어 S2B 검색을 건너뜁니다.")
             return None
 
+        cached, result = self._from_local(model_name)
+        if cached: return result
+
         print(f"    🕵️ [S2B Enricher] 모델명 '{model_name}' 정보 탐색 중...")
+        done, result = self._fetch_http(model_name)
+        if done: return result
+        return self._fetch_browser(model_name)
+
+    def fetch_many(self, models, concurrency=ENRICH_CONCURRENCY):
+        """
+        여러 모델명을 병렬로 조회하여 끝나는 순서대로 (모델명, 결과)를 yield 합니다.
+        - 정규화 모델명 기준 중복 제거 (처음 나온 표기로 1회만 조회)
+        - 캐시 적중분을 먼저 내보내고, 나머지는 직접 요청(HTTP)을 스레드 concurrency개로 동시 처리
+        - 브라우저 폴백은 Playwright 스레드 제약 때문에 호출 스레드에서 순차 처리
+          (직접 요청 템플릿이 아직 없으면 학습될 때까지 브라우저로 먼저 조회)
+        """
+        unique = {}
+        for model_name in models:
+            key = normalize_model(model_name)
+            if key and key not in unique: unique[key] = model_name
+
+        queue = []
+        for model_name in unique.values():
+            cached, result = self._from_local(model_name)
+            if cached: yield model_name, result
+            else: queue.append(model_name)
+
+        while queue and (self.http is None or not self.http.ready):
+            model_name = queue.pop(0)
+            print(f"    🕵️ [S2B Enricher] 모델명 '{model_name}' 정보 탐색 중... (브라우저)")
+            yield model_name, self._fetch_browser(model_name)
+        if not queue: return
+
+        print(f"    🧵 [S2B Enricher] {len(queue)}건 직접 요청 (동시 {concurrency}개)")
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            futures = {pool.submit(self._fetch_http, model_name): model_name for model_name in queue}
+            for future in as_completed(futures):
+                model_name = futures[future]
+                done, result = future.result()
+                yield model_name, result if done else self._fetch_browser(model_name)
+
+    def _from_local(self, model_name):
+        """캐시 -> 미러 순서로 조회. (찾음 여부, 결과)"""
+        if self.cache:
+            cached, result = self.cache.get(model_name)
+            if cached:
+                print(f"    💾 [S2B Enricher] 캐시 사용: '{model_name}' ({'매칭' if result else '결과 없음'})")
+                return True, result
+        if self.mirror:
+            with perf_stats.timed("s2b.mirror"):
+                result = self.mirror.lookup(model_name)
+            if result:
+                print(f"    🪞 [S2B Enricher] 미러 사용: '{model_name}'")
+                return True, result
+        return False, None
+
+    def _remember(self, model_name, result):
+        """정상 완료된 실시간 조회 결과를 캐시/미러에 기록"""
+        if self.cache: self.cache.put(model_name, result)
+        if self.mirror and result: self.mirror.record_live(model_name, result)
+
+    def _fetch_http(self, model_name):
+        """직접 요청 경로 (여러 스레드에서 호출 가능). (완료 여부, 결과)"""
+        if self.http is None or not self.http.ready: return False, None
+        try:
+            with perf_stats.timed("s2b.http"):
+                done, result = self._lookup_http(model_name)
+        except Exception as e:
+            print(f"    ⚠️ [S2B HTTP] '{model_name}' 처리 오류: {e}")
+            done, result = False, None
+        if not done:
+            print(f"    ↩️ [S2B HTTP] '{model_name}' 직접 요청 실패 -> 브라우저로 재시도")
+            return False, None
+        self._remember(model_name, result)
+        return True, result
+
+    def _fetch_browser(self, model_name):
+        """브라우저 경로 (세션을 연 스레드에서만 호출)"""
+        page = self._checkout()
+        if page is None: return None
+
+        ok = False
+        try:
+            with perf_stats.timed("s2b.lookup"):
+                result = self._lookup(page, model_name)
+            ok = True
+            self._remember(model_name, result)
+            self._sync_cookies()
+            return result
+        except Exception as e:
+            print(f"    ❌ 오류 발생: {e}")
+            RATE_LIMITER.failure(self.s2b_home, "timeout" if "Timeout" in str(e) else "error")
+            return None
+        finally:
+            self._checkin(page, ok)
+
+    def _lookup_http(self, model_name):
+        """직접 요청 경로. (완료 여부, 결과): 완료=False면 브라우저 폴백 필요"""
+        links = self.http.search(model_name, max_rows=None)
+        if links is None: return False, None
+        target_js_code = self._choose_candidate(model_name, links)
+        if not target_js_code: return True, None
+
+        parser = self.http.detail(target_js_code)
+        if parser is None: return False, None
+        result = parse_s2b_detail(parser.text, parser.category_candidates, parser.rows)
+        # 상세페이지 형식 불일치 또는 일부만 추출됨 -> 캐시/미러에 남기지 않고 브라우저로 폴백
+        if not (result["g2b_code"] and result["category"]): return False, None
+
+        print(f"    ✅ 확보 완료(HTTP): G2B({result['g2b_code']}), 제조사({result['manufacturer']})")
+        return True, result
+
+    def _choose_candidate(self, model_name, candidates):
+        """최고 점수 후보의 goViewPage 코드, 기준 미달이면 None (상세페이지 방문 없이 '결과 없음')"""
+        if not candidates:
+            print("    ⚠️ S2B 검색 결과 없음 (AI 변환 값 사용 예정)")
+            return None
+        best, score = pick_best_candidate(model_name, candidates)
+        if best is None or score < MATCH_THRESHOLD:
+            print(f"    ⚠️ S2B 검색 결과 {len(candidates)}건 중 일치 후보 없음 (최고 {score:.2f} < {MATCH_THRESHOLD})")
+            return None
+        print(f"    🎯 후보 선택 ({score:.2f}): {best[1][:40]}")
+        return best[0]
+
+    def _lookup(self, page, model_name):
+        """대기 중인 탭에서 검색 -> 상세페이지 진입 -> 정보 추출 (직접 요청 템플릿이 없으면 실제 요청을 관찰해 학습)"""
+        seen = []
+        def on_request(req):
+            if req.resource_type in ("document", "xhr", "fetch"):
+                seen.append((req.method, req.url, req.post_data))
+
+        learning = self.http is not None and not self.http.ready
+        if learning: page.on("request", on_request)
+        try:
+            return self._lookup_browser(page, model_name, seen if learning else None)
+        finally:
+            if learning: page.remove_listener("request", on_request)
+
+    def _lookup_browser(self, page, model_name, seen=None):
+        """브라우저 경로 (seen 목록이 주어지면 검색/상세 요청을 기록하여 직접 요청 템플릿을 학습)"""
+        # 1. 검색어 입력 (외부에서 받은 model_name 사용)
+        search_input = self._search_input(page)
+        if not search_input: raise RuntimeError("S2B 검색창을 찾을 수 없습니다")
+
+        search_input.click(); search_input.clear()
+        RATE_LIMITER.acquire(self.s2b_home)
+        page.keyboard.type(model_name, delay=50) # <-- 여기에 실제 데이터가 들어갑니다
+        page.keyboard.press("Enter")
         
-        with sync_playwright() as p:
-            try:
-                # 1. 브라우저 연결
-                try:
-                    browser = p.chromium.connect_over_cdp(self.cdp_url)
-                except Exception as e:
-                    print(f"    ❌ 크롬 연결 실패: {e}")
-                    return None
-
-                context = browser.contexts[0]
-                if context.pages: page = context.pages[0]
-                else: page = context.new_page()
-
-                # 2. S2B 접속 및 팝업 무력화 (필수)
-                page.goto(self.s2b_home, wait_until="domcontentloaded")
-                page.add_init_script("""
-                    window.open = function(url) { window.location.href = url; return window; };
-                    document.addEventListener('submit', (e) => { 
-                        if(e.target.target === '_blank') e.target.target = '_self'; 
-                    }, true);
-                """)
-                time.sleep(0.5)
-
-                # 3. 검색어 입력 (외부에서 받은 model_name 사용)
-                search_input = None
-                for sel in ["input#unifiedSearchQuery", "input[name='query']", "input[type='text']"]:
-                    if page.locator(sel).count() > 0 and page.locator(sel).first.is_visible():
-                        search_input = page.locator(sel).first; break
-                
-                if not search_input: return None
-
-                search_input.click(); search_input.clear()
-                page.keyboard.type(model_name, delay=50) # <-- 여기에 실제 데이터가 들어갑니다
-                page.keyboard.press("Enter")
-                
-                try: page.wait_for_selector("tbody tr", timeout=3000)
-                except: pass
-
-                # 4. 상세페이지 링크(goViewPage) 탐색
-                rows = page.locator("tbody tr").all()
-                target_js_code = None
-                
-                for i in range(min(len(rows), 5)):
-                    row = rows[i]
-                    links = row.locator("a").all()
-                    for link in links:
-                        href = link.get_attribute("href") or ""
-                        txt = link.inner_text().strip()
-                        if "goViewPage" in href and len(txt) > 5:
-                            target_js_code = href.replace("javascript:", "")
-                            break
-                    if target_js_code: break
-                
-                if not target_js_code:
-                    print("    ⚠️ S2B 검색 결과 없음 (AI 변환 값 사용 예정)")
-                    return None
-
-                # 5. 상세페이지 진입
-                page.evaluate(target_js_code)
-                page.wait_for_load_state("networkidle", timeout=5000)
-                time.sleep(1)
-
-                # =========================================================
-                # [데이터 추출 로직] (v8 성공 로직 적용)
-                # =========================================================
-                result = {
-                    "g2b_code": "",
-                    "category": "",
-                    "manufacturer": "",
-                    "origin": "",
-                    "kc_list": []
-                }
-                
-                full_text = page.locator("body").inner_text()
-                
-                # (1) G2B 식별번호
-                g2b_match = re.search(r"(\d{8})-(\d{8})", full_text)
-                if g2b_match: result["g2b_code"] = g2b_match.group(2)
-
-                # (2) 카테고리
-                candidates = page.locator("div, span, p, td").all()
-                for el in candidates:
-                    try:
-                        if not el.is_visible(): continue
-                        txt = el.inner_text().strip()
-                        if " > " in txt and "HOME" not in txt and "견적" not in txt and 10 < len(txt) < 100:
-                            result["category"] = txt
-                            break
-                    except: continue
-
-                # (3) 제조사 / 원산지 (정밀 파싱)
-                try:
-                    target_elements = page.get_by_text(re.compile(r"제조사.*원산지")).all()
-                    target_text = ""
-                    min_len = 9999
-                    for el in target_elements:
-                        try:
-                            row_el = el.locator("xpath=./ancestor::tr[1]")
-                            if row_el.count() > 0:
-                                txt = row_el.inner_text().strip()
-                                if len(txt) < 200 and len(txt) < min_len:
-                                    min_len = len(txt)
-                                    target_text = txt
-                        except: continue
-
-                    if target_text:
-                        val_part = ""
-                        if ":" in target_text: val_part = target_text.split(":", 1)[1].strip()
-                        else: val_part = target_text.replace("제조사", "").replace("원산지", "").replace("/", "", 1).strip()
-                        
-                        parts = [p.strip() for p in val_part.split("/") if p.strip()]
-                        if len(parts) >= 1:
-                            result["origin"] = parts[-1]
-                            result["manufacturer"] = parts[0]
-                            if len(parts) >= 3: result["manufacturer"] = f"{parts[0]} ({parts[1]})"
-                except: pass
-
-                # (4) KC 인증번호
-                all_rows = page.locator("tr").all()
-                found_kc = []
-                for row in all_rows:
-                    row_txt = row.inner_text().strip()
-                    if "인증" in row_txt or "적합성" in row_txt:
-                        cat = None
-                        if "어린이" in row_txt: cat = "어린이제품"
-                        elif "전기" in row_txt: cat = "전기용품"
-                        elif "생활" in row_txt: cat = "생활용품"
-                        elif "방송" in row_txt or "통신" in row_txt: cat = "방송통신"
-                        
-                        if cat and "비대상" not in row_txt and "없음" not in row_txt:
-                            match = re.search(r"\[([A-Za-z0-9\-]+)\]", row_txt)
-                            if match:
-                                code = match.group(1).strip()
-                                item = {"category": cat, "code": code}
-                                if item not in found_kc: found_kc.append(item)
-                result["kc_list"] = found_kc
-
-                print(f"    ✅ 확보 완료: G2B({result['g2b_code']}), 제조사({result['manufacturer']})")
-                return result
+        try: page.wait_for_selector("tbody tr", timeout=3000)
+        except: pass
+        if seen is not None:
+            self.http.learn_search(seen, model_name)
+            seen.clear()
 
-            except Exception as e:
-                print(f"    ❌ 오류 발생: {e}")
-                return None
\ No newline at end of file
+        # 2. 검색 결과 전체를 1회 evaluate로 가져와 모델명 일치 점수가 가장 높은 후보 선택
+        with perf_stats.timed("s2b.search.evaluate"):
+            candidates = page.evaluate(_SEARCH_ROWS_JS)
+        target_js_code = self._choose_candidate(model_name, candidates)
+        if not target_js_code: return None
+
+        # 3. 상세페이지 진입
+        RATE_LIMITER.acquire(self.s2b_home)
+        page.evaluate(target_js_code)
+        page.wait_for_load_state("networkidle", timeout=5000)
+        if seen is not None: self.http.learn_detail(seen, target_js_code)
+
+        # =========================================================
+        # [데이터 추출 로직] 1회 evaluate로 수집 후 Python에서 파싱 (HTTP 경로와 공용)
+        # =========================================================
+        with perf_stats.timed("s2b.detail.evaluate"):
+            snap = page.evaluate(_DETAIL_JS)
+        result = parse_s2b_detail(snap["text"], snap["categories"], snap["rows"])
+
+        print(f"    ✅ 확보 완료: G2B({result['g2b_code']}), 제조사({result['manufacturer']})")
+        return result
@@ -0,0 +1,108 @@
+import re
+import json
+import time
+import sqlite3
+import threading
+
+# ======================================================
+# [설정] S2B 보강 결과 캐시 정책
+# ======================================================
+ENRICH_CACHE_DB = 's2b_enrich_cache.db'
+HIT_TTL_DAYS = 30           # 매칭 성공 결과 유효 기간
+MISS_TTL_DAYS = 3           # 매칭 실패(검색 결과 없음) 유효 기간 -> 이후 재검색
+MAX_ENTRIES = 50000         # 초과 시 가장 오래 사용하지 않은 항목부터 삭제 (LRU)
+EVICT_CHECK_EVERY = 200     # put N회마다 크기 점검
+
+def normalize_model(model_name):
+    """캐시 키용 모델명 정규화: 대문자화 + 공백/하이픈/기호 제거 (예: 'ab-123 w' -> 'AB123W')"""
+    return re.sub(r"[^0-9A-Z가-힣]", "", (model_name or "").upper())
+
+class EnrichCache:
+    """
+    모델명 -> S2B 보강 결과 캐시 (SQLite)
+    - 성공 결과(g2b_code, category, manufacturer, origin, kc_list)와 실패(결과 없음)를 모두 저장하며 TTL을 따로 적용
+    - get()은 (캐시 존재 여부, 결과) 튜플을 반환합니다. 실패 캐시는 (True, None)
+    - 항목 수가 max_entries를 넘으면 last_used 기준으로 오래된 항목을 삭제합니다.
+    - 여러 스레드에서 동시에 호출해도 안전합니다.
+    """
+
+    def __init__(self, path=ENRICH_CACHE_DB, hit_ttl_days=HIT_TTL_DAYS, miss_ttl_days=MISS_TTL_DAYS,
+                 max_entries=MAX_ENTRIES):
+        self.path = path
+        self.hit_ttl = hit_ttl_days * 86400
+        self.miss_ttl = miss_ttl_days * 86400
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS enrich_cache (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                result TEXT,
+                stored_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_enrich_last_used ON enrich_cache (last_used)")
+        self._conn.commit()
+        self._puts = 0
+        self.counts = {"hit": 0, "negative": 0, "expired": 0, "absent": 0}
+
+    def get(self, model_name):
+        key = normalize_model(model_name)
+        if not key: return False, None
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT result, stored_at FROM enrich_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.counts["absent"] += 1
+                return False, None
+            result, stored_at = row
+            if now - stored_at > (self.hit_ttl if result is not None else self.miss_ttl):
+                self.counts["expired"] += 1
+                return False, None
+            self._conn.execute("UPDATE enrich_cache SET last_used = ? WHERE key = ?", (now, key))
+            self._conn.commit()  # 커밋하지 않으면 암묵적 트랜잭션이 열린 채로 남아 다른 프로세스의 쓰기를 막음
+            self.counts["hit" if result is not None else "negative"] += 1
+        return True, json.loads(result) if result is not None else None
+
+    def put(self, model_name, result):
+        """result가 None이면 '검색 결과 없음'으로 기록합니다. (오류로 끝난 조회는 기록하지 마세요)"""
+        key = normalize_model(model_name)
+        if not key: return
+        now = time.time()
+        payload = json.dumps(result, ensure_ascii=False) if result is not None else None
+        with self._lock:
+            self._conn.execute("""
+                INSERT INTO enrich_cache (key, model, result, stored_at, last_used) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    model = excluded.model, result = excluded.result,
+                    stored_at = excluded.stored_at, last_used = excluded.last_used
+            """, (key, model_name, payload, now, now))
+            self._conn.commit()
+            self._puts += 1
+            if self._puts % EVICT_CHECK_EVERY == 0: self._evict_locked()
+
+    def _evict_locked(self):
+        total = self._conn.execute("SELECT COUNT(*) FROM enrich_cache").fetchone()[0]
+        excess = total - self.max_entries
+        if excess <= 0: return
+        self._conn.execute("""
+            DELETE FROM enrich_cache WHERE key IN (
+                SELECT key FROM enrich_cache ORDER BY last_used LIMIT ?
+            )
+        """, (excess,))
+        self._conn.commit()
+        print(f"    🧹 [EnrichCache] 오래된 항목 {excess}건 삭제")
+
+    def stats(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT result IS NOT NULL, COUNT(*) FROM enrich_cache GROUP BY 1").fetchall()
+        stored = {("hit" if found else "miss"): n for found, n in rows}
+        return {"lookups": dict(self.counts), "stored": stored}
+
+    def close(self):
+        with self._lock:
+            self._evict_locked()
+            self._conn.commit()
+            self._conn.close()
@@ -0,0 +1,38 @@
+import time
+import threading
+from contextlib import contextmanager
+
+# ======================================================
+# [성능 계측] 구간별 호출 횟수 / 누적 시간 카운터
+# ======================================================
+_lock = threading.Lock()
+_stats = {}
+
+def record(name, seconds):
+    with _lock:
+        count, total, worst = _stats.get(name, (0, 0.0, 0.0))
+        _stats[name] = (count + 1, total + seconds, max(worst, seconds))
+
+@contextmanager
+def timed(name):
+    """with timed("specs.evaluate"): ... 형태로 구간 시간을 누적합니다."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - started)
+
+def snapshot():
+    """{이름: {"count", "total", "avg", "max"}} 형태의 현재 통계"""
+    with _lock:
+        return {
+            name: {"count": c, "total": t, "avg": t / c if c else 0.0, "max": w}
+            for name, (c, t, w) in _stats.items()
+        }
+
+def report(title="성능 통계"):
+    stats = snapshot()
+    if not stats: return
+    print(f"\n⏱️ [{title}]")
+    for name, s in sorted(stats.items()):
+        print(f"    {name:<28} {s['count']:>6}회 | 평균 {s['avg'] * 1000:8.1f}ms | 최대 {s['max'] * 1000:8.1f}ms | 합계 {s['total']:8.2f}s")
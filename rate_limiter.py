@@ -0,0 +1,119 @@
+import time
+import random
+import threading
+from urllib.parse import urlsplit
+
+# ======================================================
+# [설정] 호스트별 요청 속도 정책 (초당 요청 수)
+# ======================================================
+HOST_POLICIES = {
+    "coupang.com": {"rate": 1.0, "min_rate": 0.1, "max_rate": 4.0, "burst": 2},
+    "s2b.kr":      {"rate": 1.0, "min_rate": 0.2, "max_rate": 3.0, "burst": 1},
+}
+DEFAULT_POLICY = {"rate": 1.0, "min_rate": 0.1, "max_rate": 2.0, "burst": 1}
+
+SPEEDUP_STEP = 0.05      # 정상 응답 1건마다 초당 요청 수 증가폭 (가산 증가)
+SLOWDOWN_FACTOR = 0.5    # 실패 시 속도 배율 (승산 감소)
+BACKOFF_BASE = 2.0       # 연속 실패 시 대기 시간: BASE * 2^(실패횟수-1) 초
+BACKOFF_MAX = 300.0
+
+class _Bucket:
+    def __init__(self, policy, share=1.0):
+        self.rate = policy["rate"] * share
+        self.min_rate = policy["min_rate"] * share
+        self.max_rate = policy["max_rate"] * share
+        self.capacity = max(1, round(policy["burst"] * share))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.failures = 0
+        self.blocked_until = 0.0
+        self.ok = 0
+        self.errors = {}
+
+    def refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+class HostRateLimiter:
+    """
+    호스트별 적응형 토큰 버킷 (여러 스레드가 공유)
+    - acquire(url): 해당 호스트 토큰이 생길 때까지 대기
+    - success(url): 속도를 조금씩 올림 (max_rate까지)
+    - failure(url, reason): 속도를 절반으로 낮추고 지수 백오프 동안 해당 호스트 요청을 멈춤
+      (로그인 리다이렉트, 타임아웃, 에러 페이지 등)
+    - set_share(share): 여러 프로세스가 같은 호스트에 요청할 때(샤딩) 이 프로세스 몫의 비율만 사용
+    """
+
+    def __init__(self, policies=HOST_POLICIES):
+        self.policies = policies
+        self.share = 1.0
+        self._lock = threading.Lock()
+        self._buckets = {}
+
+    def set_share(self, share):
+        """모든 호스트 정책의 속도/버스트에 share를 곱합니다. (예: 샤드 N개면 1/N -> 프로세스 합계가 정책 속도)"""
+        with self._lock:
+            self.share = share
+            self._buckets = {}
+
+    def _host(self, url_or_host):
+        host = urlsplit(url_or_host).hostname if "://" in url_or_host else url_or_host.split("/")[0]
+        host = (host or "").lower()
+        for suffix in self.policies:
+            if host == suffix or host.endswith("." + suffix):
+                return suffix
+        return host
+
+    def _bucket(self, host):
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = _Bucket(self.policies.get(host, DEFAULT_POLICY), self.share)
+        return bucket
+
+    def acquire(self, url_or_host):
+        """토큰 1개를 얻을 때까지 대기하고, 대기한 시간(초)을 반환합니다."""
+        host = self._host(url_or_host)
+        waited = 0.0
+        while True:
+            with self._lock:
+                bucket = self._bucket(host)
+                now = time.monotonic()
+                bucket.refill(now)
+                if now < bucket.blocked_until:
+                    wait = bucket.blocked_until - now
+                elif bucket.tokens >= 1:
+                    bucket.tokens -= 1
+                    return waited
+                else:
+                    wait = (1 - bucket.tokens) / bucket.rate
+            time.sleep(wait)
+            waited += wait
+
+    def success(self, url_or_host):
+        with self._lock:
+            bucket = self._bucket(self._host(url_or_host))
+            bucket.ok += 1
+            bucket.failures = 0
+            bucket.rate = min(bucket.max_rate, bucket.rate + SPEEDUP_STEP)
+
+    def failure(self, url_or_host, reason="error"):
+        host = self._host(url_or_host)
+        with self._lock:
+            bucket = self._bucket(host)
+            bucket.failures += 1
+            bucket.errors[reason] = bucket.errors.get(reason, 0) + 1
+            bucket.rate = max(bucket.min_rate, bucket.rate * SLOWDOWN_FACTOR)
+            backoff = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (bucket.failures - 1)) * random.uniform(0.8, 1.2)
+            bucket.blocked_until = time.monotonic() + backoff
+            bucket.tokens = 0.0
+        print(f"    🐢 [RateLimit] {host} {reason} -> {backoff:.1f}초 대기, 속도 {bucket.rate:.2f}req/s")
+
+    def stats(self):
+        with self._lock:
+            return {
+                host: {"rate": round(b.rate, 2), "ok": b.ok, "errors": dict(b.errors), "failures_in_row": b.failures}
+                for host, b in self._buckets.items()
+            }
+
+# 프로세스 공용 인스턴스 (크롤러와 S2B 보강 모듈이 함께 사용)
+RATE_LIMITER = HostRateLimiter()
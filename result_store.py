@@ -0,0 +1,164 @@
+import os
+import json
+import time
+import threading
+
+# ======================================================
+# [설정] 저장 정책
+# ======================================================
+SYNC_EVERY_N = 20         # N건 append마다 fsync
+SYNC_INTERVAL = 2.0       # 또는 마지막 fsync 이후 N초 경과 시
+COMPACT_GARBAGE_RATIO = 0.5
+
+class ResultStore:
+    """
+    Append-only JSONL 결과 저장소
+    - 역할: 아이템 1건 = JSON 1줄. 같은 키가 다시 기록되면 마지막 줄이 최신본 (전체 재작성 없음)
+    - 안정성: fsync는 배치 단위로 수행, 중간에 잘린 마지막 줄은 읽을 때 무시
+    - 정리: compact()로 최신본만 임시파일에 기록 후 os.replace (원자적 교체)
+    """
+
+    def __init__(self, path, key_fn=None, sync_every=SYNC_EVERY_N, sync_interval=SYNC_INTERVAL):
+        self.path = path
+        self.key_fn = key_fn or (lambda record: record.get("url"))
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self._lock = threading.RLock()
+        self._fh = None
+        self._pending = 0
+        self._last_sync = time.time()
+
+    # ---------------- 쓰기 ----------------
+    def _open(self):
+        if self._fh is None:
+            torn_tail = False
+            if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+                with open(self.path, 'rb') as f:
+                    f.seek(-1, os.SEEK_END)
+                    torn_tail = f.read(1) != b"\n"
+            self._fh = open(self.path, 'a', encoding='utf-8')
+            # 이전 실행이 줄 중간에서 중단된 경우, 다음 레코드가 잘린 줄에 붙지 않도록 줄바꿈 보정
+            if torn_tail: self._fh.write("\n")
+        return self._fh
+
+    def append(self, record):
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            fh = self._open()
+            fh.write(line)
+            self._pending += 1
+            if self._pending >= self.sync_every or time.time() - self._last_sync >= self.sync_interval:
+                self._sync_locked()
+
+    def sync(self):
+        with self._lock:
+            self._sync_locked()
+
+    def _sync_locked(self):
+        if self._fh is None: return
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+        self._pending = 0
+        self._last_sync = time.time()
+
+    def close(self):
+        with self._lock:
+            self._sync_locked()
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+    # ---------------- 읽기 ----------------
+    def _index(self):
+        """키 -> 최신 줄의 파일 오프셋 (최초 등장 순서 유지), 전체 줄 수"""
+        index = {}
+        lines = 0
+        if not os.path.exists(self.path): return index, lines
+        with self._lock:
+            if self._fh is not None: self._fh.flush()
+        with open(self.path, 'rb') as f:
+            offset = 0
+            for raw in f:
+                start = offset
+                offset += len(raw)
+                if not raw.endswith(b"\n"): break   # 기록 도중 잘린 줄
+                try:
+                    record = json.loads(raw)
+                except ValueError:
+                    continue
+                lines += 1
+                index[self.key_fn(record)] = start
+        return index, lines
+
+    def iter_records(self):
+        """키별 최신 레코드를 순서대로 스트리밍합니다 (메모리에는 오프셋 인덱스만 유지)."""
+        index, _ = self._index()
+        if not index: return
+        with open(self.path, 'rb') as f:
+            for offset in index.values():
+                f.seek(offset)
+                yield json.loads(f.readline())
+
+    def load_all(self):
+        return list(self.iter_records())
+
+    def keys(self):
+        return set(self._index()[0].keys())
+
+    def __len__(self):
+        return len(self._index()[0])
+
+    # ---------------- 정리 / 내보내기 ----------------
+    def compact(self, force=False):
+        """중복 버전이 COMPACT_GARBAGE_RATIO 이상이면 최신본만 남기도록 원자적으로 재작성합니다."""
+        with self._lock:
+            index, lines = self._index()
+            if not lines: return False
+            garbage = 1 - len(index) / lines
+            if not force and garbage < COMPACT_GARBAGE_RATIO: return False
+
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as out:
+                for record in self.iter_records():
+                    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+                os.fsync(out.fileno())
+
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+            os.replace(tmp_path, self.path)
+            print(f"    🧹 [Store] 압축 완료: {lines}줄 -> {len(index)}줄")
+            return True
+
+    def export_json(self, json_path):
+        """기존 도구 호환용 JSON 배열 파일을 원자적으로 생성합니다 (실행당 1회)."""
+        tmp_path = json_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.load_all(), f, ensure_ascii=False, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, json_path)
+
+    def merge_from(self, other_path, remove=True):
+        """다른 JSONL 저장소(샤드 결과 등)의 최신본을 이 저장소에 추가하고, 반영 후 원본을 삭제합니다."""
+        if not os.path.exists(other_path): return 0
+        other = ResultStore(other_path, key_fn=self.key_fn)
+        merged = 0
+        for record in other.iter_records():
+            self.append(record)
+            merged += 1
+        self.sync()
+        if remove: os.remove(other_path)
+        return merged
+
+    def import_json(self, json_path):
+        """기존 JSON 배열 파일을 저장소로 가져옵니다 (최초 1회 마이그레이션)."""
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                records = json.load(f)
+        except: return 0
+        for record in records:
+            self.append(record)
+        self.sync()
+        return len(records)
@@ -0,0 +1,322 @@
+import os
+import re
+import json
+import threading
+import requests
+from html.parser import HTMLParser
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from requests.adapters import HTTPAdapter
+
+from rate_limiter import RATE_LIMITER
+
+# ======================================================
+# [설정] S2B 직접 요청 (브라우저 없이 검색/상세 조회)
+# ======================================================
+S2B_COOKIES_FILE = 's2b_cookies.json'
+S2B_TEMPLATE_FILE = 's2b_request_templates.json'
+S2B_HTTP_TIMEOUT = 8
+S2B_MAX_INFLIGHT = 4       # S2B 호스트 동시 요청 상한 (호출 스레드 수와 무관)
+S2B_HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept-Language": "ko-KR,ko;q=0.9",
+}
+_CANDIDATE_ENCODINGS = ("utf-8", "euc-kr")
+_PAGE_PARAM_NAMES = ("pageNo", "pageIndex", "currentPage", "curPage", "page")   # 검색 템플릿의 페이지 번호 파라미터 후보
+
+# ======================================================
+# [모듈 1] HTML 파서 (검색 결과 / 상세페이지)
+# ======================================================
+_BLOCK_TAGS = {"br", "p", "div", "li", "tr", "table", "h1", "h2", "h3", "h4", "dt", "dd"}
+_CANDIDATE_TAGS = {"div", "span", "p", "td"}
+_VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+_CANDIDATE_MAX = 200      # 카테고리 후보는 짧은 텍스트만 필요 -> 이 길이를 넘으면 누적 중단
+
+def parse_goviewpage_args(js_code):
+    """"goViewPage('123', '456')" -> ['123', '456']"""
+    match = re.search(r"goViewPage\s*\((.*)\)", js_code or "", re.S)
+    if not match: return []
+    return [a or b or c for a, b, c in re.findall(r"'([^']*)'|\"([^\"]*)\"|([^,\s]+)", match.group(1))]
+
+class S2BSearchParser(HTMLParser):
+    """검색 결과 tbody의 행별 [(href, 링크 텍스트)] 목록 + 행 전체 텍스트"""
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.rows = []
+        self.row_texts = []
+        self._tbody = 0
+        self._row = None
+        self._row_text = None
+        self._link = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "tbody": self._tbody += 1
+        elif tag == "tr" and self._tbody: self._row, self._row_text = [], []
+        elif tag == "a" and self._row is not None:
+            self._link = [dict(attrs).get("href") or "", []]
+
+    def handle_endtag(self, tag):
+        if tag == "tbody": self._tbody = max(0, self._tbody - 1)
+        elif tag == "a" and self._link is not None:
+            self._row.append((self._link[0], "".join(self._link[1]).strip()))
+            self._link = None
+        elif tag == "tr" and self._row is not None:
+            self.rows.append(self._row)
+            self.row_texts.append(re.sub(r"\s+", " ", "".join(self._row_text)).strip())
+            self._row = self._row_text = None
+
+    def handle_data(self, data):
+        if self._link is not None: self._link[1].append(data)
+        if self._row_text is not None: self._row_text.append(data + " ")
+
+    def view_links(self, max_rows=5):
+        """상위 max_rows행의 [(goViewPage 코드(javascript: 제거), 링크 텍스트, 행 텍스트)] (행 순서)"""
+        out = []
+        for row, row_text in list(zip(self.rows, self.row_texts))[:max_rows]:
+            for href, text in row:
+                if "goViewPage" in href and len(text) > 5:
+                    out.append((href.replace("javascript:", ""), text, row_text))
+                    break
+        return out
+
+class S2BDetailParser(HTMLParser):
+    """
+    상세페이지 HTML 1회 순회로 본문 텍스트, 표 행 텍스트, 카테고리 후보(div/span/p/td 텍스트)를 수집합니다.
+    (브라우저 경로의 추출 결과와 같은 형태 -> parse_s2b_detail()로 공통 처리)
+    """
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._text = []
+        self.rows = []
+        self._skip = None
+        self._row = None
+        self._cell = None
+        self._stack = []           # 열린 태그: [tag, 시작 순번, 텍스트 버퍼, 누적 길이, 숨김 여부(상위 포함), 후보 여부]
+        self._order = 0
+        self._candidates = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ("script", "style", "noscript"):
+            self._skip = tag
+            return
+        a = dict(attrs)
+        if tag not in _VOID_TAGS:
+            hidden = bool(self._stack and self._stack[-1][4]) or "hidden" in a \
+                or re.search(r"display\s*:\s*none", a.get("style") or "") is not None
+            self._stack.append([tag, self._order, [], 0, hidden, tag in _CANDIDATE_TAGS])
+            self._order += 1
+        if tag == "tr": self._row = []
+        elif tag in ("th", "td") and self._row is not None: self._cell = []
+        if tag in _BLOCK_TAGS: self._append_text("\n")
+
+    def handle_endtag(self, tag):
+        if tag == self._skip:
+            self._skip = None
+            return
+        if tag in ("th", "td") and self._cell is not None:
+            self._row.append("".join(self._cell).strip())
+            self._cell = None
+        elif tag == "tr" and self._row is not None:
+            self.rows.append("\t".join(c for c in self._row if c))
+            self._row = None
+        if tag in _BLOCK_TAGS: self._append_text("\n")
+        # 열려 있는 태그일 때만, 닫히지 않은 하위 태그까지 함께 정리 (짝 없는 닫는 태그는 무시)
+        if tag not in _VOID_TAGS and any(entry[0] == tag for entry in self._stack):
+            while self._stack:
+                entry = self._stack.pop()
+                if entry[5] and not entry[4] and entry[3] <= _CANDIDATE_MAX:
+                    self._candidates.append((entry[1], re.sub(r"\s+", " ", "".join(entry[2])).strip()))
+                if entry[0] == tag: break
+
+    def handle_data(self, data):
+        if self._skip: return
+        if self._cell is not None: self._cell.append(data)
+        self._append_text(data)
+
+    def _append_text(self, data):
+        self._text.append(data)
+        for entry in self._stack:
+            if entry[5] and entry[3] <= _CANDIDATE_MAX:
+                entry[2].append(data)
+                entry[3] += len(data)
+
+    @property
+    def text(self):
+        return re.sub(r"\n\s*\n+", "\n", "".join(self._text))
+
+    @property
+    def category_candidates(self):
+        """카테고리 후보 텍스트 (문서 순서 = 시작 태그 순서)"""
+        return [t for _, t in sorted(self._candidates) if t]
+
+# ======================================================
+# [모듈 2] 요청 템플릿 학습 + 직접 요청 클라이언트
+# ======================================================
+def _decode_params(raw_query):
+    """쿼리/폼 문자열을 후보 인코딩별로 해석 -> {인코딩: [(k, v)]}"""
+    out = {}
+    for enc in _CANDIDATE_ENCODINGS:
+        try: out[enc] = parse_qsl(raw_query or "", keep_blank_values=True, encoding=enc, errors="strict")
+        except (UnicodeDecodeError, LookupError): continue
+    return out
+
+def _split_request(method, url, post_data):
+    """(요청 URL, 파라미터 원문): GET은 쿼리스트링, POST는 폼 본문"""
+    if method == "GET":
+        parts = urlsplit(url)
+        return urlunsplit((parts.scheme, parts.netloc, parts.path, "", "")), parts.query
+    return url, post_data or ""
+
+class S2BHttpClient:
+    """
+    로그인 쿠키를 재사용하는 S2B 직접 요청 클라이언트
+    - 검색/상세 요청 형식은 사이트 스크립트에 숨어 있으므로, 브라우저 경로에서 실제로 나간 요청을 1회 관찰하여
+      템플릿(메서드, URL, 파라미터, 치환 위치)을 학습하고 S2B_TEMPLATE_FILE에 저장합니다.
+    - 검색: 검색어 파라미터만 치환 / 상세: goViewPage(...) 인자와 같은 값을 가진 파라미터를 치환
+    - 학습 전이거나 로그인 만료/형식 불일치 시 None을 반환 -> 호출자가 브라우저 경로로 폴백
+    """
+
+    def __init__(self, cookies_file=S2B_COOKIES_FILE, template_file=S2B_TEMPLATE_FILE, pool_size=4):
+        self.cookies_file = cookies_file
+        self.template_file = template_file
+        self.session = requests.Session()
+        self.session.headers.update(S2B_HTTP_HEADERS)
+        self.session.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=pool_size))
+        self._lock = threading.Lock()
+        self._inflight = threading.BoundedSemaphore(S2B_MAX_INFLIGHT)
+        self.cookies = []          # 마지막으로 반영한 Playwright 형식 쿠키 (다른 브라우저 프로필에 주입용)
+        self.templates = {}
+        try:
+            with open(template_file, 'r', encoding='utf-8') as f:
+                self.templates = json.load(f)
+        except: pass
+        self.load_cookies()
+
+    @property
+    def ready(self):
+        return "search" in self.templates and "detail" in self.templates
+
+    # ---------------- 쿠키 ----------------
+    def load_cookies(self, cookies=None):
+        """Playwright 형식 쿠키 목록(없으면 파일)을 세션에 반영합니다."""
+        if cookies is None:
+            try:
+                with open(self.cookies_file, 'r', encoding='utf-8') as f:
+                    cookies = json.load(f)
+            except: return 0
+        for c in cookies:
+            self.session.cookies.set(c["name"], c["value"], domain=c.get("domain"), path=c.get("path", "/"))
+        self.cookies = list(cookies)
+        return len(cookies)
+
+    def save_cookies(self, cookies):
+        """브라우저에서 갱신된 쿠키를 세션과 파일에 반영합니다."""
+        cookies = [c for c in cookies if "s2b.kr" in (c.get("domain") or "")]
+        if not cookies: return
+        self.load_cookies(cookies)
+        tmp_path = self.cookies_file + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cookies, f, ensure_ascii=False)
+        os.replace(tmp_path, self.cookies_file)
+
+    # ---------------- 템플릿 학습 ----------------
+    def _save_templates(self):
+        tmp_path = self.template_file + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.templates, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.template_file)
+
+    def learn_search(self, requests_seen, model_name):
+        """검색어가 파라미터 값으로 들어간 요청을 검색 템플릿으로 저장"""
+        if "search" in self.templates: return True
+        for method, url, post_data in requests_seen:
+            base_url, raw = _split_request(method, url, post_data)
+            for enc, params in _decode_params(raw).items():
+                slot = next((k for k, v in params if v.strip() == model_name.strip()), None)
+                if slot is None: continue
+                with self._lock:
+                    self.templates["search"] = {"method": method, "url": base_url, "params": params,
+                                                "slot": slot, "encoding": enc}
+                    self._save_templates()
+                print(f"    📝 [S2B HTTP] 검색 요청 템플릿 학습: {method} {base_url} (검색어={slot})")
+                return True
+        return False
+
+    def learn_detail(self, requests_seen, js_code):
+        """goViewPage 인자 값이 파라미터로 들어간 문서 요청을 상세 템플릿으로 저장"""
+        if "detail" in self.templates: return True
+        args = parse_goviewpage_args(js_code)
+        if not args: return False
+        for method, url, post_data in requests_seen:
+            base_url, raw = _split_request(method, url, post_data)
+            for enc, params in _decode_params(raw).items():
+                # 짧은 값('1', 'Y' 등)은 우연히 일치할 수 있으므로 치환 위치로 쓰지 않음
+                slots = {k: args.index(v) for k, v in params if len(v) >= 3 and v in args}
+                if not slots: continue
+                with self._lock:
+                    self.templates["detail"] = {"method": method, "url": base_url, "params": params,
+                                                "slots": slots, "encoding": enc}
+                    self._save_templates()
+                print(f"    📝 [S2B HTTP] 상세 요청 템플릿 학습: {method} {base_url} (인자={slots})")
+                return True
+        return False
+
+    # ---------------- 요청 ----------------
+    def _request(self, template, params):
+        body = urlencode(params, encoding=template["encoding"])
+        try:
+            with self._inflight:
+                RATE_LIMITER.acquire(template["url"])
+                if template["method"] == "GET":
+                    resp = self.session.get(f"{template['url']}?{body}", timeout=S2B_HTTP_TIMEOUT)
+                else:
+                    resp = self.session.post(template["url"], data=body, timeout=S2B_HTTP_TIMEOUT,
+                                             headers={"Content-Type": "application/x-www-form-urlencoded"})
+        except requests.RequestException as e:
+            RATE_LIMITER.failure(template["url"], "timeout" if isinstance(e, requests.Timeout) else "error")
+            return None
+
+        if resp.status_code == 429 or resp.status_code >= 500:
+            RATE_LIMITER.failure(template["url"], f"HTTP {resp.status_code}")
+            return None
+        # 로그인 만료/권한 오류는 속도 문제가 아니므로 감속하지 않고 폴백만 유도
+        if resp.status_code >= 400 or "Login" in resp.url or 'type="password"' in resp.text:
+            return None
+        RATE_LIMITER.success(template["url"])
+        if resp.encoding is None or resp.encoding.lower() == "iso-8859-1":
+            resp.encoding = resp.apparent_encoding or template["encoding"]
+        return resp.text
+
+    @property
+    def can_page(self):
+        """학습된 검색 템플릿에 페이지 번호 파라미터가 있는지 (목록 순회용)"""
+        params = (self.templates.get("search") or {}).get("params", [])
+        return any(k in _PAGE_PARAM_NAMES for k, _ in params)
+
+    def search(self, model_name, page=None, max_rows=5):
+        """검색 결과의 goViewPage 링크 목록, 요청 불가/로그인 만료 시 None (page는 can_page일 때만 적용)"""
+        template = self.templates.get("search")
+        if not template: return None
+        params = []
+        for k, v in template["params"]:
+            if k == template["slot"]: v = model_name
+            elif page is not None and k in _PAGE_PARAM_NAMES: v = str(page)
+            params.append((k, v))
+        html = self._request(template, params)
+        if html is None: return None
+        parser = S2BSearchParser()
+        parser.feed(html)
+        return parser.view_links(max_rows)
+
+    def detail(self, js_code):
+        """goViewPage(...) 인자로 상세페이지 HTML을 파싱한 S2BDetailParser, 실패 시 None"""
+        template = self.templates.get("detail")
+        args = parse_goviewpage_args(js_code)
+        if not template or not args: return None
+        slots = template["slots"]
+        if max(slots.values()) >= len(args): return None
+        params = [(k, args[slots[k]] if k in slots else v) for k, v in template["params"]]
+        html = self._request(template, params)
+        if html is None: return None
+        parser = S2BDetailParser()
+        parser.feed(html)
+        return parser
@@ -0,0 +1,227 @@
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import threading
+
+import perf_stats
+from enrich_cache import normalize_model
+from s2b_http import S2BHttpClient, parse_goviewpage_args
+from data_enricher import parse_s2b_detail
+
+# ======================================================
+# [설정] S2B 카탈로그 미러
+# ======================================================
+MIRROR_DB = 's2b_mirror.db'
+CATEGORY_FILE = 's2b_categories.json'
+MIRROR_MAX_PAGES = 5          # 검색어(카테고리명)당 최대 목록 페이지 수
+MIRROR_REFRESH_DAYS = 30      # 이보다 오래된 상품만 상세페이지 재방문
+
+# ======================================================
+# [모듈 1] 상세페이지 모델명 추출
+# ======================================================
+def parse_model_row(rows):
+    """'모델명\\tABC-123' 형태(라벨/값 셀 쌍)의 행에서 모델명을 찾습니다."""
+    for row in rows:
+        cells = [c.strip() for c in (row or "").split("\t")]
+        for label, value in zip(cells, cells[1:]):
+            if "모델" in label and len(label) < 15 and value:
+                return value
+    return ""
+
+def leaf_category_names(categories):
+    """s2b_categories.json의 최하위 분류명 목록 (중복 제거, 순서 유지)"""
+    names = []
+    for c1 in categories.get("category1", []):
+        c2_list = categories.get("category2", {}).get(c1["value"], [])
+        if not c2_list: names.append(c1["text"])
+        for c2 in c2_list:
+            c3_list = categories.get("category3", {}).get(f"{c1['value']}_{c2['value']}", [])
+            names += [c3["text"] for c3 in c3_list] if c3_list else [c2["text"]]
+    return list(dict.fromkeys(n.strip() for n in names if n.strip()))
+
+# ======================================================
+# [모듈 2] 로컬 카탈로그 저장소
+# ======================================================
+class S2BMirror:
+    """
+    S2B 상품 카탈로그 로컬 미러 (SQLite)
+    - 상품 1건 = 1행 (goods_key: goViewPage 인자, 실시간 조회로 기록된 행은 'model:<정규화 모델명>')
+    - 모델명 원문(model)과 정규화 모델명(model_norm)에 각각 인덱스 -> lookup()은 정확 일치 후 정규화 일치 순서
+    - MIRROR_REFRESH_DAYS보다 오래된 행은 lookup()에서 제외 (보강 캐시의 HIT_TTL_DAYS가 만료된 뒤 오래된 값이 계속 쓰이지 않도록)
+    - 대량 구축(build_mirror)과 S2B_Enricher의 실시간 조회 결과 기록(write-through)으로 채워집니다.
+    - 여러 스레드에서 동시에 호출해도 안전합니다.
+    """
+
+    def __init__(self, path=MIRROR_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS catalog (
+                goods_key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                model_norm TEXT NOT NULL,
+                title TEXT,
+                g2b_code TEXT,
+                category TEXT,
+                manufacturer TEXT,
+                origin TEXT,
+                kc_list TEXT,
+                source TEXT,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_catalog_model ON catalog (model);
+            CREATE INDEX IF NOT EXISTS idx_catalog_model_norm ON catalog (model_norm);
+            CREATE TABLE IF NOT EXISTS walked (
+                query TEXT PRIMARY KEY,
+                pages INTEGER NOT NULL,
+                items INTEGER NOT NULL,
+                finished_at REAL NOT NULL
+            );
+        """)
+        self._conn.commit()
+
+    def lookup(self, model_name, max_age_days=MIRROR_REFRESH_DAYS):
+        """
+        모델명 -> 보강 결과 dict 또는 None (G2B 번호가 있는 최신 행 우선)
+        max_age_days보다 오래된 행은 없는 것으로 취급 -> 호출자가 실시간으로 다시 조회하여 갱신
+        """
+        order = "ORDER BY g2b_code != '' DESC, updated_at DESC LIMIT 1"
+        cols = "g2b_code, category, manufacturer, origin, kc_list"
+        since = time.time() - max_age_days * 86400
+        with self._lock:
+            row = self._conn.execute(f"SELECT {cols} FROM catalog WHERE model = ? AND updated_at >= ? {order}",
+                                     (model_name.strip(), since)).fetchone()
+            if row is None:
+                norm = normalize_model(model_name)
+                if not norm: return None
+                row = self._conn.execute(f"SELECT {cols} FROM catalog WHERE model_norm = ? AND updated_at >= ? {order}",
+                                         (norm, since)).fetchone()
+        if row is None: return None
+        g2b_code, category, manufacturer, origin, kc_list = row
+        return {"g2b_code": g2b_code or "", "category": category or "", "manufacturer": manufacturer or "",
+                "origin": origin or "", "kc_list": json.loads(kc_list or "[]")}
+
+    def upsert(self, goods_key, model_name, result, title="", source="live", commit=True):
+        if not model_name or not result: return
+        with self._lock:
+            self._conn.execute("""
+                INSERT OR REPLACE INTO catalog
+                    (goods_key, model, model_norm, title, g2b_code, category, manufacturer, origin, kc_list, source, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (goods_key, model_name.strip(), normalize_model(model_name), title,
+                  result.get("g2b_code", ""), result.get("category", ""), result.get("manufacturer", ""),
+                  result.get("origin", ""), json.dumps(result.get("kc_list", []), ensure_ascii=False),
+                  source, time.time()))
+            if commit: self._conn.commit()
+
+    def record_live(self, model_name, result):
+        """S2B_Enricher 실시간 조회 결과 기록 (write-through)"""
+        self.upsert(f"model:{normalize_model(model_name)}", model_name, result, source="live")
+
+    def fresh(self, goods_key, max_age_days=MIRROR_REFRESH_DAYS):
+        with self._lock:
+            row = self._conn.execute("SELECT updated_at FROM catalog WHERE goods_key = ?", (goods_key,)).fetchone()
+        return row is not None and time.time() - row[0] < max_age_days * 86400
+
+    def walked(self, query, max_age_days=MIRROR_REFRESH_DAYS):
+        with self._lock:
+            row = self._conn.execute("SELECT finished_at FROM walked WHERE query = ?", (query,)).fetchone()
+        return row is not None and time.time() - row[0] < max_age_days * 86400
+
+    def mark_walked(self, query, pages, items):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO walked (query, pages, items, finished_at) VALUES (?, ?, ?, ?)",
+                               (query, pages, items, time.time()))
+            self._conn.commit()
+
+    def commit(self):
+        with self._lock:
+            self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM catalog").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+# ======================================================
+# [모듈 3] 대량 구축 (카테고리명 검색 -> 목록 -> 상세)
+# ======================================================
+def build_mirror(mirror, client=None, queries=None, max_pages=MIRROR_MAX_PAGES, max_queries=None):
+    """
+    카테고리 최하위 분류명을 학습된 검색 템플릿으로 조회하며 목록/상세페이지를 미러에 적재합니다.
+    - 요청 속도는 RATE_LIMITER(s2b.kr 정책)가 제한하고, 이미 순회한 검색어/최근 적재한 상품은 건너뜁니다.
+    - 반환: 이번 실행에서 적재한 상품 수
+    """
+    client = client or S2BHttpClient()
+    if not client.ready:
+        print("❌ [Mirror] S2B 요청 템플릿이 없습니다. 보강(Phase 2)을 브라우저로 1회 실행해 학습하세요.")
+        return 0
+    if queries is None:
+        with open(CATEGORY_FILE, 'r', encoding='utf-8') as f:
+            queries = leaf_category_names(json.load(f))
+    if not client.can_page:
+        print("    ⚠️ [Mirror] 검색 템플릿에 페이지 파라미터가 없어 검색어당 첫 페이지만 순회합니다.")
+        max_pages = 1
+
+    stored = 0
+    todo = [q for q in queries if not mirror.walked(q)]
+    if max_queries: todo = todo[:max_queries]
+    print(f"🪞 [Mirror] 검색어 {len(todo)}개 순회 (전체 {len(queries)}개, 현재 {len(mirror)}건)")
+
+    for qi, query in enumerate(todo, 1):
+        pages = items = 0
+        seen = set()
+        for page_no in range(1, max_pages + 1):
+            with perf_stats.timed("mirror.search"):
+                links = client.search(query, page=page_no, max_rows=None)
+            if links is None:
+                print(f"    ❌ [Mirror] '{query}' 검색 실패 (로그인 만료 또는 차단) -> 중단")
+                mirror.commit()
+                return stored
+            new_links = [(js, title) for js, title, _ in links if js not in seen]
+            if not new_links: break
+            pages += 1
+
+            for js_code, title in new_links:
+                seen.add(js_code)
+                goods_key = "|".join(parse_goviewpage_args(js_code))
+                if not goods_key or mirror.fresh(goods_key): continue
+                with perf_stats.timed("mirror.detail"):
+                    parser = client.detail(js_code)
+                if parser is None: continue
+                model_name = parse_model_row(parser.rows)
+                result = parse_s2b_detail(parser.text, parser.category_candidates, parser.rows)
+                if not model_name or not result["g2b_code"]: continue
+                mirror.upsert(goods_key, model_name, result, title=title, source="bulk", commit=False)
+                items += 1
+            mirror.commit()
+
+        mirror.mark_walked(query, pages, items)
+        stored += items
+        print(f"    🪞 [{qi}/{len(todo)}] '{query}': {pages}페이지, {items}건 적재")
+
+    print(f"✅ [Mirror] 완료: 이번 실행 {stored}건 적재, 전체 {len(mirror)}건")
+    return stored
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="S2B 카탈로그 로컬 미러 구축")
+    parser.add_argument("--max-pages", type=int, default=MIRROR_MAX_PAGES, help="검색어당 최대 목록 페이지 수")
+    parser.add_argument("--max-queries", type=int, help="이번 실행에서 순회할 검색어 수 상한")
+    parser.add_argument("--query", nargs="+", metavar="KEYWORD", help="카테고리 대신 지정한 검색어만 순회")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args(sys.argv[1:])
+    mirror = S2BMirror()
+    try:
+        build_mirror(mirror, queries=args.query, max_pages=args.max_pages, max_queries=args.max_queries)
+    finally:
+        mirror.close()
+        perf_stats.report("미러 구축 통계")
@@ -0,0 +1,75 @@
+import os
+import gzip
+import json
+import time
+import hashlib
+import threading
+
+from result_store import ResultStore
+from crawl_frontier import product_key
+
+# ======================================================
+# [설정] 스냅샷 보관소
+# ======================================================
+ARCHIVE_DIR = 'snapshots'
+COMPRESS_LEVEL = 6
+
+class SnapshotArchive:
+    """
+    상품 페이지 스냅샷 보관소 (Content-Addressed + gzip)
+    - objects/ab/<sha256>.json.gz : DOM/원본 HTML, 페이지 캡처(capture_page 결과), API 응답 값, 상세 이미지 URL (내용이 같으면 1개만 저장)
+    - index.jsonl                 : 상품 키 -> 최신 스냅샷 해시 (ResultStore 재사용)
+    - 브라우저 없이 추출 로직을 다시 돌리는 --reparse 모드와 파서 벤치마크용 픽스처로 사용합니다.
+    """
+
+    def __init__(self, root=ARCHIVE_DIR, index_name="index.jsonl"):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self.index = ResultStore(os.path.join(root, index_name),
+                                 key_fn=lambda entry: product_key(entry.get("url", "")))
+        self._lock = threading.Lock()
+
+    def _object_path(self, sha):
+        return os.path.join(self.objects_dir, sha[:2], f"{sha}.json.gz")
+
+    def save(self, url, html=None, capture=None, detail_images=None, source="browser", api=None):
+        """
+        스냅샷을 저장하고 해시를 반환합니다.
+        (브라우저 경로는 렌더링된 DOM(outerHTML) + capture + 캡처 모드 API 값, HTTP 경로는 원본 html)
+        """
+        payload = json.dumps({
+            "url": url, "html": html, "capture": capture, "api": api,
+            "detail_images": detail_images or [], "source": source,
+        }, ensure_ascii=False, sort_keys=True).encode("utf-8")
+        sha = hashlib.sha256(payload).hexdigest()
+
+        path = self._object_path(sha)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(gzip.compress(payload, COMPRESS_LEVEL))
+            os.replace(tmp_path, path)
+
+        with self._lock:
+            self.index.append({"url": url, "sha": sha, "ts": time.time(), "size": len(payload)})
+        return sha
+
+    def load(self, sha):
+        with open(self._object_path(sha), "rb") as f:
+            return json.loads(gzip.decompress(f.read()))
+
+    def iter_snapshots(self):
+        """상품별 최신 스냅샷을 스트리밍합니다."""
+        for entry in self.index.iter_records():
+            try:
+                yield self.load(entry["sha"])
+            except Exception as e:
+                print(f"    ⚠️ [Archive] 스냅샷 손상/누락 {entry.get('sha', '')[:12]}: {e}")
+
+    def __len__(self):
+        return len(self.index)
+
+    def close(self):
+        self.index.close()
@@ -0,0 +1,39 @@
+import os
+import tempfile
+
+from crawl_frontier import CrawlFrontier, product_key, normalize_coupang_url
+
+# ======================================================
+# [테스트] 상품 키 / 수집 대기열 중복 제거 (브라우저 불필요)
+# ======================================================
+URL_A = ("https://www.coupang.com/vp/products/8610798143?itemId=19665760789&vendorItemId=86771432026"
+         "&q=%EC%A0%84%EC%9E%90&searchId=d027098a15810727&sourceType=search&rank=2&traceId=mlg787wn")
+
+def test_product_key_ignores_tracking_params():
+    same = "coupang.com/vp/products/8610798143?traceId=zzz&vendorItemId=86771432026&itemId=19665760789"
+    assert product_key(URL_A) == "8610798143/19665760789/86771432026"
+    assert product_key(same) == product_key(URL_A)
+
+def test_product_key_keeps_options_apart():
+    other_option = "https://www.coupang.com/vp/products/8610798143?itemId=1&vendorItemId=2"
+    assert product_key(other_option) != product_key(URL_A)
+    assert product_key("https://www.coupang.com/vp/products/8610798143") == "8610798143"
+
+def test_normalize_coupang_url():
+    assert normalize_coupang_url(URL_A) == (
+        "https://www.coupang.com/vp/products/8610798143?itemId=19665760789&vendorItemId=86771432026")
+    assert normalize_coupang_url("www.coupang.com/np/search?q=x") == "https://www.coupang.com/np/search?q=x"
+
+def test_frontier_dedupes_and_persists():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "frontier.db")
+        frontier = CrawlFrontier(path)
+        assert frontier.add([URL_A, URL_A + "&rank=9"]) == 1
+        frontier.mark_done(URL_A)
+        frontier.close()
+
+        frontier = CrawlFrontier(path)
+        assert frontier.add([URL_A]) == 0
+        assert frontier.status(product_key(URL_A)) == "done"
+        assert frontier.pending() == []
+        frontier.close()
@@ -0,0 +1,99 @@
+import json
+
+from coupang_crawler import RawPageParser, build_item_from_html, snapshot_from_html, shipping_fee, parse_api_payloads
+
+# ======================================================
+# [테스트] HTML 고속 경로 파서 (브라우저 불필요)
+# ======================================================
+_LD = json.dumps({
+    "@type": "Product", "name": "삼성 전자레인지 (MS23C3535AK)", "image": ["https://img.example.com/main.jpg"],
+    "offers": {"price": "129000"},
+}, ensure_ascii=False)
+
+PRODUCT_HTML = f"""<html><head>
+<script type="application/ld+json">{_LD}</script>
+<script>var ignored = "<td>무시</td>";</script>
+</head><body>
+<table><tr><th>제조자</th><td>삼성전자</td></tr><tr><th>제조국</th><td>말레이시아</td></tr></table>
+<ul class="prod-description-attribute"><li>모델명: MS23C3535AK</li></ul>
+<p>KC 인증번호 XU10000-12345</p>
+<div id="productDetail"><img src="//img.example.com/detail1.jpg"><img data-src="https://img.example.com/d.gif">
+<div><img src="https://img.example.com/detail2.png"></div></div>
+<img src="https://img.example.com/outside.jpg">
+</body></html>"""
+
+def test_raw_page_parser_collects_fields():
+    parsed = RawPageParser()
+    parsed.feed(PRODUCT_HTML)
+    parsed.close()
+    assert len(parsed.json_ld) == 1
+    assert parsed.rows == [["제조자", "삼성전자"], ["제조국", "말레이시아"]]
+    assert parsed.attr_items == ["모델명: MS23C3535AK"]
+    assert parsed.detail_images == ["https://img.example.com/detail1.jpg", "https://img.example.com/detail2.png"]
+    assert "무시" not in parsed.text
+
+def _parse(html):
+    parsed = RawPageParser()
+    parsed.feed(html)
+    parsed.close()
+    return parsed
+
+def test_unclosed_li_in_attribute_list():
+    parsed = _parse('<ul class="prod-description-attribute"><li>a: 1<li>b: 2</ul><ul><li>c: 3</li></ul>')
+    assert parsed.attr_items == ["a: 1", "b: 2"]
+
+def test_unclosed_tag_does_not_extend_detail_container():
+    parsed = _parse('<div id="productDetail"><p>x<img src="https://img.example.com/d.jpg"></div>'
+                    '<img src="https://img.example.com/banner.jpg">')
+    assert parsed.detail_images == ["https://img.example.com/d.jpg"]
+
+def test_unclosed_table_cells():
+    parsed = _parse("<table><tr><th>제조국<td>한국<tr><th>모델명<td>AB-1</table>")
+    assert parsed.rows == [["제조국", "한국"], ["모델명", "AB-1"]]
+
+def test_build_item_from_html():
+    item = build_item_from_html("https://www.coupang.com/vp/products/1", PRODUCT_HTML)
+    assert item["name"] == "삼성 전자레인지 (MS23C3535AK)"
+    assert item["image"] == "https://img.example.com/main.jpg"
+    assert item["price"] == 129000 + 3000          # 무료배송 문구 없음 -> 배송비 가산
+    assert item["model"] == "MS23C3535AK"
+    assert item["maker"] == "삼성전자" and item["origin"] == "말레이시아"
+    assert item["kc"] == "XU10000-12345"
+    assert len(item["detail_images"]) == 2
+
+def test_missing_offer_price_is_detectable_before_surcharge():
+    html = PRODUCT_HTML.replace('"offers": {"price": "129000"}', '"offers": {}')
+    snap, _ = snapshot_from_html(html)
+    item = build_item_from_html("https://www.coupang.com/vp/products/1", html)
+    assert item["price"] == 3000
+    assert item["price"] - shipping_fee(snap) == 0
+
+def test_api_values_overlay_snapshot():
+    api = {"price": 99000, "free_shipping": True, "rows": [["제조국", "한국"], ["모델명", "API-MODEL"]]}
+    item = build_item_from_html("https://www.coupang.com/vp/products/1", PRODUCT_HTML, api)
+    assert item["price"] == 99000
+    assert item["origin"] == "말레이시아"           # 같은 키는 DOM 값 우선
+    assert item["model"] == "MS23C3535AK"
+
+def test_api_payloads_ignore_other_products():
+    url = "https://www.coupang.com/vp/products/1?itemId=10&vendorItemId=100"
+    payloads = [
+        ("https://www.coupang.com/next-api/recommend", {"items": [
+            {"productId": 2, "vendorItemId": 200, "salePrice": 5000, "freeShipping": True,
+             "attributes": [{"name": "제조국", "value": "중국"}]},
+        ]}),
+        ("https://www.coupang.com/vp/products/1/items/10/vendoritems/100", {"vendorItemId": 100, "salePrice": 99000,
+            "attributes": [{"name": "색상", "value": "화이트"}]}),
+        ("https://www.coupang.com/vp/products/1/items", {"options": [{"vendorItemId": 101, "salePrice": 1}]}),
+    ]
+    api = parse_api_payloads(payloads, url)
+    assert api["price"] == 99000
+    assert api["free_shipping"] is None
+    assert api["rows"] == [["색상", "화이트"]]
+
+def test_api_payloads_without_own_price_keep_json_ld():
+    payloads = [("https://www.coupang.com/next-api/ads", [{"productId": 3, "salePrice": 1000}])]
+    api = parse_api_payloads(payloads, "https://www.coupang.com/vp/products/1")
+    assert api["price"] is None
+    item = build_item_from_html("https://www.coupang.com/vp/products/1", PRODUCT_HTML, api)
+    assert item["price"] == 129000 + 3000
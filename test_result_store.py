@@ -0,0 +1,93 @@
+import os
+import json
+import tempfile
+
+from result_store import ResultStore
+
+# ======================================================
+# [테스트] ResultStore 중단 복구 / 압축 (브라우저 불필요)
+# ======================================================
+def _store(tmp_dir, name="results.jsonl"):
+    return ResultStore(os.path.join(tmp_dir, name), key_fn=lambda record: record.get("url"))
+
+def test_torn_tail_is_ignored_and_repaired():
+    """기록 도중 중단되어 잘린 마지막 줄은 읽기에서 제외되고, 다음 기록이 그 줄에 붙지 않아야 합니다."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = _store(tmp_dir)
+        store.append({"url": "a", "price": 1})
+        store.append({"url": "b", "price": 2})
+        store.close()
+
+        # 프로세스가 줄 중간에서 죽은 상황 재현
+        with open(store.path, "a", encoding="utf-8") as f:
+            f.write('{"url": "c", "pri')
+        assert [r["url"] for r in store.iter_records()] == ["a", "b"]
+
+        store = _store(tmp_dir)
+        store.append({"url": "d", "price": 4})
+        store.close()
+        assert [r["url"] for r in store.iter_records()] == ["a", "b", "d"]
+        assert len(store) == 3
+
+def test_latest_version_wins():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = _store(tmp_dir)
+        store.append({"url": "a", "price": 1})
+        store.append({"url": "b", "price": 2})
+        store.append({"url": "a", "price": 3})
+        store.close()
+        assert store.load_all() == [{"url": "a", "price": 3}, {"url": "b", "price": 2}]
+
+def test_compact_keeps_latest_and_replaces_atomically():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = _store(tmp_dir)
+        for price in range(5):
+            store.append({"url": "a", "price": price})
+        store.append({"url": "b", "price": 9})
+
+        assert store.compact() is True
+        assert not os.path.exists(store.path + ".tmp")
+        with open(store.path, encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f]
+        assert lines == [{"url": "a", "price": 4}, {"url": "b", "price": 9}]
+
+        # 압축 후에도 같은 인스턴스로 계속 기록 가능
+        store.append({"url": "c", "price": 7})
+        store.close()
+        assert [r["url"] for r in store.iter_records()] == ["a", "b", "c"]
+
+def test_compact_skips_below_garbage_ratio():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = _store(tmp_dir)
+        store.append({"url": "a", "price": 1})
+        store.append({"url": "b", "price": 2})
+        store.append({"url": "a", "price": 3})
+        store.close()
+        size = os.path.getsize(store.path)
+        assert store.compact() is False
+        assert os.path.getsize(store.path) == size
+        assert store.compact(force=True) is True
+        assert len(store.load_all()) == 2
+
+def test_compact_drops_torn_tail():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = _store(tmp_dir)
+        store.append({"url": "a", "price": 1})
+        store.close()
+        with open(store.path, "a", encoding="utf-8") as f:
+            f.write('{"url": "b"')
+        assert store.compact(force=True) is True
+        with open(store.path, encoding="utf-8") as f:
+            assert f.read() == '{"url": "a", "price": 1}\n'
+
+def test_merge_from_removes_source():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        main, shard = _store(tmp_dir), _store(tmp_dir, "shard0.jsonl")
+        main.append({"url": "a", "price": 1})
+        shard.append({"url": "a", "price": 5})
+        shard.append({"url": "b", "price": 2})
+        shard.close()
+        assert main.merge_from(shard.path) == 2
+        assert not os.path.exists(shard.path)
+        main.close()
+        assert main.load_all() == [{"url": "a", "price": 5}, {"url": "b", "price": 2}]
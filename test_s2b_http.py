@@ -0,0 +1,58 @@
+from s2b_http import S2BSearchParser, S2BDetailParser, parse_goviewpage_args
+from data_enricher import parse_s2b_detail
+
+# ======================================================
+# [테스트] S2B 검색/상세 HTML 파서 (브라우저/로그인 불필요)
+# ======================================================
+SEARCH_HTML = """<table><thead><tr><th>상품명</th></tr></thead><tbody>
+<tr><td><a href="#">찜</a><a href="javascript:goViewPage('2024001', 'A');">삼성 전자레인지 MS23C3535AK</a></td><td>129,000원</td></tr>
+<tr><td><a href="javascript:goViewPage('2024002', 'B');">짧음</a></td></tr>
+<tr><td><a href="javascript:goViewPage(&quot;2024003&quot;, &quot;C&quot;)">LG 전자레인지 MW23BD</a></td></tr>
+</tbody></table>"""
+
+DETAIL_HTML = """<html><body>
+<div style="display:none"><span>숨김 > 분류 > 경로입니다</span></div>
+<div class="path"><span>HOME > 가전 > 주방가전</span></div>
+<p>가전제품 > 주방가전 > 전자레인지</p>
+<table>
+<tr><th>물품목록번호</th><td>12345678-87654321</td></tr>
+<tr><th>제조사 / 원산지</th><td>삼성전자 / 말레이시아</td></tr>
+<tr><th>전기용품 안전인증</th><td>[HU07123-17001]</td></tr>
+<tr><th>어린이제품 인증</th><td>비대상</td></tr>
+</table>
+<script>var x = "12345678-00000000";</script>
+</body></html>"""
+
+def test_goviewpage_args():
+    assert parse_goviewpage_args("goViewPage('1', \"2\", 3)") == ["1", "2", "3"]
+    assert parse_goviewpage_args("alert(1)") == []
+
+def test_search_parser_view_links():
+    parser = S2BSearchParser()
+    parser.feed(SEARCH_HTML)
+    links = parser.view_links(max_rows=5)
+    assert [text for _, text, _ in links] == ["삼성 전자레인지 MS23C3535AK", "LG 전자레인지 MW23BD"]
+    js_code, _, row_text = links[0]
+    assert js_code == "goViewPage('2024001', 'A');"
+    assert "129,000원" in row_text
+    assert parse_goviewpage_args(links[1][0]) == ["2024003", "C"]
+
+def test_detail_parser_feeds_parse_s2b_detail():
+    parser = S2BDetailParser()
+    parser.feed(DETAIL_HTML)
+    parser.close()
+    assert "숨김 > 분류 > 경로입니다" not in parser.category_candidates
+    result = parse_s2b_detail(parser.text, parser.category_candidates, parser.rows)
+    assert result == {
+        "g2b_code": "87654321",
+        "category": "가전제품 > 주방가전 > 전자레인지",
+        "manufacturer": "삼성전자",
+        "origin": "말레이시아",
+        "kc_list": [{"category": "전기용품", "code": "HU07123-17001"}],
+    }
+
+def test_unclosed_tag_in_hidden_block_does_not_hide_rest():
+    parser = S2BDetailParser()
+    parser.feed('<div style="display:none"><p>x</div><p>가전 > 주방 > 전자레인지</p>')
+    parser.close()
+    assert parser.category_candidates == ["가전 > 주방 > 전자레인지"]
@@ -0,0 +1,26 @@
+from data_enricher import score_candidate, pick_best_candidate, MATCH_THRESHOLD
+
+# ======================================================
+# [테스트] S2B 검색 결과 후보 점수화 (브라우저 불필요)
+# ======================================================
+def test_exact_and_normalized_token_match():
+    assert score_candidate("MS23C3535AK", "삼성 전자레인지 MS23C3535AK 23L") == 1.0
+    assert score_candidate("MS23C-3535AK", "삼성 전자레인지 MS23C3535AK") == 0.9
+
+def test_split_model_in_link_text():
+    assert score_candidate("SFN123", "신일 SFN 123 선풍기", "신일 SFN 123 선풍기") == 0.7
+
+def test_split_rule_ignores_unrelated_row_tokens():
+    """가격 등 이웃한 무관 토큰이 이어 붙어 모델명처럼 보이면 안 됨"""
+    text = "상품명 AB 12,000원"
+    assert score_candidate("AB12", text) < MATCH_THRESHOLD
+    assert score_candidate("AB12", text, "상품명") < MATCH_THRESHOLD
+    assert score_candidate("AB12", text, text) < MATCH_THRESHOLD
+
+def test_pick_best_candidate_prefers_matching_row():
+    candidates = [
+        ("goViewPage('1')", "다른 상품 모음전", "AB 12,000원"),
+        ("goViewPage('2')", "전자레인지 AB12 화이트", "15,000원"),
+    ]
+    best, score = pick_best_candidate("AB12", candidates)
+    assert best[0] == "goViewPage('2')" and score == 1.0